@@ -2,9 +2,27 @@
 Application configuration and environment variables.
 """
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+# Production env comes from the orchestrator; skip the .env lookup there.
+# Reloads (tests, uvicorn --reload workers) inherit the already-populated env.
+_SKIP_DOTENV = (
+    os.environ.get("APP_ENV", "").lower() == "production"
+    or bool(os.environ.get("SKIP_DOTENV"))
+    or bool(os.environ.get("DOTENV_LOADED"))
+)
+if not _SKIP_DOTENV:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    os.environ["DOTENV_LOADED"] = "1"
+
+
+def _envbool(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
 
 # LLM Configuration
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "anthropic")
@@ -12,27 +30,54 @@ EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER")
 if not EMBEDDING_PROVIDER:
     EMBEDDING_PROVIDER = "local" if LLM_PROVIDER == "anthropic" else "openai"
 LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+# "auto" picks cuda, then mps, then cpu; fp16 only applies off the CPU
+LOCAL_EMBEDDING_DEVICE = os.getenv("LOCAL_EMBEDDING_DEVICE", "auto").lower()
+LOCAL_EMBEDDING_FP16 = _envbool("LOCAL_EMBEDDING_FP16", True)
+# Sentence splitter for chunking: "regex" (default) or "nupunkt" (needs nupunkt-rs)
+SENTENCE_SPLITTER = os.getenv("SENTENCE_SPLITTER", "regex").lower()
+# Texts per embedding request, and how many requests may be in flight at once
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+# In-process LRU of embedding vectors keyed by text digest (0 disables it)
+EMBEDDING_MEMORY_CACHE_SIZE = int(os.getenv("EMBEDDING_MEMORY_CACHE_SIZE", "100000"))
+
+# OpenAI account usage tier ("free", "tier1".."tier5"): caps embedding requests in flight
+OPENAI_USAGE_TIER = os.getenv("OPENAI_USAGE_TIER", "tier1").lower()
+# Retries (with backoff, honoring Retry-After) the OpenAI SDK makes on 429/5xx
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "4"))
 
 # API Keys
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 API_KEY = os.getenv("API_KEY")
 API_KEY_HASH_PEPPER = os.getenv("API_KEY_HASH_PEPPER", "")
+API_KEY_CACHE_TTL_SECONDS = float(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60"))
+API_KEY_LAST_USED_FLUSH_SECONDS = float(os.getenv("API_KEY_LAST_USED_FLUSH_SECONDS", "5"))
 
 # Logging Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_JSON = os.getenv("LOG_JSON", "false").lower() == "true"
+LOG_JSON = _envbool("LOG_JSON")
 
 # Application Configuration
 APP_NAME = os.getenv("APP_NAME", "ai-rag-service")
 APP_VERSION = os.getenv("APP_VERSION", "0.1.0")
-DEBUG = os.getenv("DEBUG", "false").lower() == "true"
-CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "").split(",") if origin.strip()]
-CORS_ALLOW_CREDENTIALS = os.getenv("CORS_ALLOW_CREDENTIALS", "false").lower() == "true"
+DEBUG = _envbool("DEBUG")
+CORS_ORIGINS = tuple(origin for origin in map(str.strip, os.getenv("CORS_ORIGINS", "").split(",")) if origin)
+# Use for membership checks.
+CORS_ORIGINS_SET = frozenset(CORS_ORIGINS)
+CORS_ALLOW_CREDENTIALS = _envbool("CORS_ALLOW_CREDENTIALS")
 MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "25"))
-RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# Threads for upload parsing/chunking (bounds how much CPU uploads can take)
+UPLOAD_WORKER_THREADS = int(os.getenv("UPLOAD_WORKER_THREADS", "4"))
+# PDFs larger than this are parsed page-parallel across PDF_PARSE_PROCESSES processes
+PDF_PARSE_PROCESSES = int(os.getenv("PDF_PARSE_PROCESSES", str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_BYTES = int(os.getenv("PDF_PARALLEL_MIN_BYTES", str(2 * 1024 * 1024)))
+RATE_LIMIT_ENABLED = _envbool("RATE_LIMIT_ENABLED", True)
 RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "120"))
 RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+RATE_LIMIT_SHARDS = int(os.getenv("RATE_LIMIT_SHARDS", "32"))
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "token_bucket")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
 
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -42,6 +87,12 @@ if not DATABASE_URL:
     else:
         raise RuntimeError("DATABASE_URL must be set when DEBUG=false")
 
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Connections opened at startup so the first requests skip connect/auth.
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", "10"))
+
 # Vector Store Configuration
 VECTOR_STORE_PROVIDER = os.getenv("VECTOR_STORE_PROVIDER")
 if not VECTOR_STORE_PROVIDER:
@@ -49,6 +100,8 @@ if not VECTOR_STORE_PROVIDER:
 if EMBEDDING_PROVIDER == "local" and VECTOR_STORE_PROVIDER == "pgvector":
     raise RuntimeError("EMBEDDING_PROVIDER=local requires VECTOR_STORE_PROVIDER=chroma")
 CHROMA_PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "./chroma_db")
+# Encode pgvector text literals with orjson rather than str() per component.
+VECTOR_FAST_SERIALIZE = _envbool("VECTOR_FAST_SERIALIZE", True)
 
 # SEC EDGAR Configuration
 SEC_USER_AGENT = os.getenv(
@@ -58,3 +111,18 @@ SEC_USER_AGENT = os.getenv(
 SEC_RATE_LIMIT_PER_SEC = float(os.getenv("SEC_RATE_LIMIT_PER_SEC", "8"))
 SEC_CACHE_DIR = os.getenv("SEC_CACHE_DIR", "./sec_cache")
 SEC_WORKER_POLL_SECONDS = float(os.getenv("SEC_WORKER_POLL_SECONDS", "3"))
+# Filings the research agent ingests at once (downloads still honor the rate limit)
+SEC_RESEARCH_INGEST_CONCURRENCY = int(os.getenv("SEC_RESEARCH_INGEST_CONCURRENCY", "5"))
+
+# Semantic cache for /ask (costs one prompt embedding per request when enabled)
+SEMANTIC_CACHE_ENABLED = _envbool("SEMANTIC_CACHE_ENABLED")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_TTL_SECONDS = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000"))
+# Sampled answers above this temperature are not meant to be reused.
+SEMANTIC_CACHE_MAX_TEMPERATURE = float(os.getenv("SEMANTIC_CACHE_MAX_TEMPERATURE", "0.3"))
+# Semantic cache for /sec/research answers (same TTL as the /ask cache)
+RESEARCH_CACHE_ENABLED = _envbool("RESEARCH_CACHE_ENABLED")
+RESEARCH_CACHE_THRESHOLD = float(os.getenv("RESEARCH_CACHE_THRESHOLD", "0.95"))
+RESEARCH_CACHE_MAX_ENTRIES = int(os.getenv("RESEARCH_CACHE_MAX_ENTRIES", "1024"))
+
@@ -0,0 +1,62 @@
+"""
+Bounded worker pools for CPU-heavy request work.
+"""
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import PDF_PARSE_PROCESSES, UPLOAD_WORKER_THREADS
+
+T = TypeVar("T")
+
+_upload_pool: Optional[ThreadPoolExecutor] = None
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_upload_pool() -> ThreadPoolExecutor:
+    """Thread pool for upload parsing/chunking, created on first use.
+
+    Kept separate from the loop's default executor so a burst of large
+    uploads queues here instead of starving other ``to_thread`` callers.
+    """
+    global _upload_pool
+    if _upload_pool is None:
+        _upload_pool = ThreadPoolExecutor(
+            max_workers=max(1, UPLOAD_WORKER_THREADS),
+            thread_name_prefix="upload-worker",
+        )
+    return _upload_pool
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Process pool for page-parallel PDF parsing, created on first use.
+
+    Uses ``spawn`` so workers never inherit the server's threads or open
+    connections.
+    """
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=max(1, PDF_PARSE_PROCESSES),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pdf_pool
+
+
+async def run_upload_work(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(*args, **kwargs)`` on the upload pool and await the result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_upload_pool(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_pools() -> None:
+    """Stop the worker pools (called on shutdown)."""
+    global _upload_pool, _pdf_pool
+    if _upload_pool is not None:
+        _upload_pool.shutdown(wait=False, cancel_futures=True)
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+    _upload_pool = None
+    _pdf_pool = None
@@ -0,0 +1,36 @@
+"""
+Shared HTTP connection pool for the async LLM and embedding SDK clients.
+"""
+import importlib.util
+from typing import Optional
+
+import httpx
+
+_async_http: Optional[httpx.AsyncClient] = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Pooled ``httpx.AsyncClient`` handed to ``AsyncOpenAI`` / ``AsyncAnthropic``, created on first use.
+
+    One pool for every provider client (including per-request API-key ones),
+    so concurrent requests reuse warm TLS connections instead of each SDK
+    instance opening its own; HTTP/2 when ``h2`` is installed. The SDKs pass
+    their own per-request timeouts; the defaults here mirror theirs.
+    """
+    global _async_http
+    if _async_http is None or _async_http.is_closed:
+        _async_http = httpx.AsyncClient(
+            timeout=httpx.Timeout(600.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            follow_redirects=True,
+            http2=importlib.util.find_spec("h2") is not None,
+        )
+    return _async_http
+
+
+async def close_async_http_client() -> None:
+    """Close the shared pool (called on shutdown)."""
+    global _async_http
+    if _async_http is not None:
+        await _async_http.aclose()
+    _async_http = None
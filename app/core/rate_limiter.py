@@ -1,32 +1,175 @@
 """
-Simple in-memory rate limiter.
+Rate limiters: per-process in-memory, or shared across workers via Redis.
 """
 import time
-from collections import deque
-from threading import Lock
-from typing import Deque, Dict
+import weakref
+from threading import Event, Lock, Thread
+from typing import Dict, List, Tuple
+
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_DEFAULT_SHARDS = 32
+# Entries untouched for this many windows are evicted by the sweeper.
+_IDLE_WINDOWS = 2
+
+STRATEGY_TOKEN_BUCKET = "token_bucket"
+STRATEGY_FIXED_WINDOW = "fixed_window"
 
 
 class RateLimiter:
-    """Fixed-window rate limiter (per-process, in-memory)."""
+    """Per-process, in-memory rate limiter.
+
+    Two strategies are supported, both storing a fixed-size pair per
+    identifier:
+
+    - ``token_bucket`` (default): ``(tokens, last_refill)``. Buckets refill at
+      ``max_requests / window_seconds`` tokens per second and cap at
+      ``max_requests``, so bursts are still bounded by the configured limit.
+    - ``fixed_window``: ``(window_start, count)``, reset when the window rolls
+      over.
+
+    State is split across ``shards`` independent ``(lock, dict)`` pairs so
+    unrelated identifiers never contend on the same lock. A daemon thread
+    sweeps every ``window_seconds`` and evicts identifiers idle for more than
+    two windows, so memory tracks active clients rather than all-time ones.
+    """
 
-    def __init__(self, max_requests: int, window_seconds: int) -> None:
+    def __init__(
+        self,
+        max_requests: int,
+        window_seconds: int,
+        shards: int = _DEFAULT_SHARDS,
+        strategy: str = STRATEGY_TOKEN_BUCKET,
+    ) -> None:
+        if shards < 1 or shards & (shards - 1):
+            raise ValueError("shards must be a positive power of two")
+        if strategy not in (STRATEGY_TOKEN_BUCKET, STRATEGY_FIXED_WINDOW):
+            raise ValueError(f"Unknown rate limit strategy: {strategy}")
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self._requests: Dict[str, Deque[float]] = {}
-        self._lock = Lock()
+        self.strategy = strategy
+        self._shard_mask = shards - 1
+        self._shards: List[Tuple[Lock, Dict[str, Tuple[float, float]]]] = [
+            (Lock(), {}) for _ in range(shards)
+        ]
+        self._stop = Event()
+        Thread(
+            target=_sweep_loop,
+            args=(weakref.ref(self), self._stop, max(1.0, float(window_seconds))),
+            name="rate-limiter-sweeper",
+            daemon=True,
+        ).start()
 
     def allow(self, identifier: str) -> bool:
+        return self.check(identifier)[0]
+
+    def check(self, identifier: str) -> Tuple[bool, float]:
+        """Consume one request; return ``(allowed, seconds until the next slot)``."""
         now = time.monotonic()
-        cutoff = now - self.window_seconds
-        with self._lock:
-            bucket = self._requests.get(identifier)
-            if bucket is None:
-                bucket = deque()
-                self._requests[identifier] = bucket
-            while bucket and bucket[0] < cutoff:
-                bucket.popleft()
-            if len(bucket) >= self.max_requests:
-                return False
-            bucket.append(now)
-            return True
+        lock, buckets = self._shards[hash(identifier) & self._shard_mask]
+        with lock:
+            if self.strategy == STRATEGY_FIXED_WINDOW:
+                return self._take_fixed_window(buckets, identifier, now)
+            return self._take_token_bucket(buckets, identifier, now)
+
+    def reset(self) -> None:
+        """Drop all bucket state."""
+        for lock, buckets in self._shards:
+            with lock:
+                buckets.clear()
+
+    def close(self) -> None:
+        """Stop the background sweeper."""
+        self._stop.set()
+
+    def _take_token_bucket(self, buckets: Dict[str, Tuple[float, float]], identifier: str, now: float) -> Tuple[bool, float]:
+        capacity = float(self.max_requests)
+        rate = capacity / self.window_seconds
+        tokens, last = buckets.get(identifier, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * rate)
+        if tokens >= 1.0:
+            buckets[identifier] = (tokens - 1.0, now)
+            return True, 0.0
+        buckets[identifier] = (tokens, now)
+        return False, (1.0 - tokens) / rate
+
+    def _take_fixed_window(self, buckets: Dict[str, Tuple[float, float]], identifier: str, now: float) -> Tuple[bool, float]:
+        start, count = buckets.get(identifier, (now, 0))
+        if now - start >= self.window_seconds:
+            start, count = now, 0
+        if count >= self.max_requests:
+            return False, self.window_seconds - (now - start)
+        buckets[identifier] = (start, count + 1)
+        return True, 0.0
+
+    def _sweep(self, now: float) -> None:
+        """Evict identifiers not seen for more than ``_IDLE_WINDOWS`` windows."""
+        # Token buckets store (tokens, last_refill); fixed windows (start, count).
+        ts_index = 0 if self.strategy == STRATEGY_FIXED_WINDOW else 1
+        cutoff = now - _IDLE_WINDOWS * self.window_seconds
+        for lock, buckets in self._shards:
+            with lock:
+                idle = [key for key, state in list(buckets.items()) if state[ts_index] < cutoff]
+                for key in idle:
+                    del buckets[key]
+
+
+def _sweep_loop(limiter_ref: "weakref.ref[RateLimiter]", stop: Event, interval: float) -> None:
+    # Holds only a weak reference so a discarded limiter can be collected.
+    while not stop.wait(interval):
+        limiter = limiter_ref()
+        if limiter is None:
+            return
+        limiter._sweep(time.monotonic())
+        del limiter
+
+
+class RedisRateLimiter:
+    """Fixed-window limiter shared across workers through Redis.
+
+    Each request is one pipelined ``INCR`` + ``EXPIRE`` on a key scoped to the
+    current window, sent through ``redis.asyncio`` so the event loop never
+    blocks on the round trip. Fails open if Redis is unreachable.
+    """
+
+    def __init__(self, redis_url: str, max_requests: int, window_seconds: int, prefix: str = "rl:") -> None:
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            raise ImportError(
+                "redis is required for RATE_LIMIT_REDIS_URL. Install with: pip install redis"
+            )
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._prefix = prefix
+        self._client = aioredis.Redis.from_url(redis_url)
+
+    async def allow(self, identifier: str) -> bool:
+        return (await self.check(identifier))[0]
+
+    async def check(self, identifier: str) -> Tuple[bool, float]:
+        """Consume one request; return ``(allowed, seconds until the next slot)``."""
+        now = time.time()
+        window = int(now // self.window_seconds)
+        key = f"{self._prefix}{identifier}:{window}"
+        try:
+            pipe = self._client.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, self.window_seconds)
+            count, _ = await pipe.execute()
+        except Exception as exc:
+            logger.warning(f"Redis rate limiter unavailable, allowing request: {exc}")
+            return True, 0.0
+        if count > self.max_requests:
+            return False, (window + 1) * self.window_seconds - now
+        return True, 0.0
+
+    async def reset(self) -> None:
+        """Drop all limiter keys under this prefix."""
+        async for key in self._client.scan_iter(match=f"{self._prefix}*"):
+            await self._client.delete(key)
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -1,9 +1,19 @@
 """
 Unified response schemas for API endpoints.
 """
-from typing import Optional, Any, Dict
-from pydantic import BaseModel, Field
-from datetime import datetime
+import operator
+from dataclasses import dataclass
+from typing import Optional, Any, Dict, Iterable, List, Tuple
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.core.time_cache import fast_utcnow
+
+
+def _utc_timestamp() -> str:
+    return fast_utcnow().isoformat() + "Z"
 
 
 class APIResponse(BaseModel):
@@ -11,10 +21,46 @@ class APIResponse(BaseModel):
     success: bool
     data: Optional[Any] = None
     error: Optional[Dict[str, Any]] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: Optional[str] = Field(default_factory=_utc_timestamp)
     request_id: Optional[str] = None
 
 
+def api_response(data: Any, request_id: Optional[str] = None) -> ORJSONResponse:
+    """Successful ``APIResponse`` envelope, serialized straight to orjson.
+
+    For handlers whose ``data`` is already plain JSON types (e.g. large list
+    pages): returning a response object skips FastAPI's response-model
+    validation and dict walk. Same JSON as ``APIResponse(success=True, ...)``.
+    """
+    return ORJSONResponse({
+        "success": True,
+        "data": data,
+        "error": None,
+        "timestamp": _utc_timestamp(),
+        "request_id": request_id,
+    })
+
+
+def record_dicts(objects: Iterable[Any], fields: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """Project objects to ``{field: attribute}`` dicts for ``api_response``.
+
+    Values are left raw: orjson encodes UUID, datetime and date natively (same
+    text as ``str()`` / ``.isoformat()``), so no per-field conversion runs in
+    Python. ``fields`` needs at least two names.
+    """
+    getter = operator.attrgetter(*fields)
+    return [dict(zip(fields, getter(obj))) for obj in objects]
+
+
+def record_columns(objects: Iterable[Any], fields: Tuple[str, ...]) -> Dict[str, List[Any]]:
+    """Columnar (struct-of-arrays) form of ``record_dicts``: ``{field: [values]}``."""
+    getter = operator.attrgetter(*fields)
+    columns = list(zip(*map(getter, objects)))
+    if not columns:
+        return {field: [] for field in fields}
+    return dict(zip(fields, map(list, columns)))
+
+
 class LLMCompletionResponse(BaseModel):
     """Response for LLM completion requests."""
     content: str
@@ -25,9 +71,55 @@ class LLMCompletionResponse(BaseModel):
     latency_ms: Optional[float] = None
 
 
-class StreamingChunk(BaseModel):
-    """Single chunk in a streaming response."""
+class StreamingChunkSchema(BaseModel):
+    """Single chunk in a streaming response (schema for API docs)."""
+    model_config = ConfigDict(extra="forbid")
+
     content: str
     done: bool = False
     model: Optional[str] = None
     provider: Optional[str] = None
+
+
+@dataclass(slots=True)
+class StreamingChunk:
+    """Single chunk in a streaming response.
+
+    Plain dataclass: built once per streamed token, so it skips Pydantic
+    validation. Serialize with ``chunk_json``.
+    """
+    content: str
+    done: bool = False
+    model: Optional[str] = None
+    provider: Optional[str] = None
+
+
+def chunk_json(chunk: StreamingChunk) -> bytes:
+    """Serialize a streaming chunk to JSON bytes."""
+    return orjson.dumps({
+        "content": chunk.content,
+        "done": chunk.done,
+        "model": chunk.model,
+        "provider": chunk.provider,
+    })
+
+
+class SSEFrameEncoder:
+    """Pre-encodes the constant part of a stream's ``StreamingChunk`` frames.
+
+    ``model``/``provider`` are fixed for a whole stream, so only the token
+    text is serialized per frame. Output matches ``chunk_json`` byte for byte.
+    """
+
+    __slots__ = ("_token_suffix", "_done_frame")
+
+    def __init__(self, model: Optional[str], provider: Optional[str]) -> None:
+        tail = b',"model":' + orjson.dumps(model) + b',"provider":' + orjson.dumps(provider) + b"}\n\n"
+        self._token_suffix = b',"done":false' + tail
+        self._done_frame = b'data: {"content":"","done":true' + tail
+
+    def token(self, content: str) -> bytes:
+        return b'data: {"content":' + orjson.dumps(content) + self._token_suffix
+
+    def done(self) -> bytes:
+        return self._done_frame
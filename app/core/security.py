@@ -1,41 +1,182 @@
 """
 API key security utilities.
 """
+import functools
 import hmac
 import hashlib
+import queue
+import time
+from collections import OrderedDict
 from datetime import datetime
+from threading import Lock, Thread
+from typing import Dict, Optional, Tuple
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import APIKeyHeader
 
+from sqlalchemy import case
 from sqlalchemy.orm import Session
 
-from app.core.config import API_KEY, DEBUG, API_KEY_HASH_PEPPER
-from app.database.database import get_db
+from app.core.config import (
+    API_KEY,
+    DEBUG,
+    API_KEY_HASH_PEPPER,
+    API_KEY_CACHE_TTL_SECONDS,
+    API_KEY_LAST_USED_FLUSH_SECONDS,
+)
+from app.core.logging_config import get_logger
+from app.core.time_cache import fast_utcnow
+from app.database.database import get_db, SessionLocal
 from app.database.models import APIKey as APIKeyModel
 
+logger = get_logger(__name__)
+
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+_API_KEY_BYTES = API_KEY.encode("utf-8") if API_KEY else None
+# sha256(pepper + key) == sha256 state with the pepper absorbed, then the key.
+_BASE_HASHER = hashlib.sha256(API_KEY_HASH_PEPPER.encode("utf-8"))
+
+_KEY_CACHE_MAX_ENTRIES = 10_000
+# key_hash -> (cached_at, expires_at); only keys found active are cached.
+_key_cache: "OrderedDict[str, Tuple[float, Optional[datetime]]]" = OrderedDict()
+_key_cache_lock = Lock()
+
+
+class _LastUsedWriter:
+    """Batch ``last_used_at`` updates so auth never holds a write transaction."""
+
+    def __init__(self, flush_interval: float, max_pending: int = 10_000):
+        self._flush_interval = flush_interval
+        self._queue: "queue.Queue[Tuple[str, datetime]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[Thread] = None
+        self._start_lock = Lock()
+
+    def enqueue(self, key_hash: str, used_at: datetime) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((key_hash, used_at))
+        except queue.Full:
+            # A dropped touch only makes last_used_at slightly stale.
+            pass
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """Write pending touches in a single UPDATE. Returns keys updated."""
+        # Coalesce to the latest touch per key.
+        latest: Dict[str, datetime] = {}
+        while True:
+            try:
+                key_hash, used_at = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            previous = latest.get(key_hash)
+            if previous is None or used_at > previous:
+                latest[key_hash] = used_at
+        if not latest:
+            return 0
+
+        session = db or SessionLocal()
+        try:
+            session.query(APIKeyModel).filter(
+                APIKeyModel.key_hash.in_(latest)
+            ).update(
+                {"last_used_at": case(latest, value=APIKeyModel.key_hash)},
+                synchronize_session=False,
+            )
+            session.commit()
+        except Exception as exc:
+            session.rollback()
+            logger.warning(f"Failed to flush API key last_used_at: {exc}")
+            return 0
+        finally:
+            if db is None:
+                session.close()
+        return len(latest)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="api-key-last-used", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self._flush_interval)
+            self.flush()
+
 
+_last_used_writer = _LastUsedWriter(flush_interval=API_KEY_LAST_USED_FLUSH_SECONDS)
+
+
+@functools.lru_cache(maxsize=1024)
 def _hash_api_key(raw_key: str) -> str:
-    payload = f"{API_KEY_HASH_PEPPER}{raw_key}".encode("utf-8")
-    return hashlib.sha256(payload).hexdigest()
+    hasher = _BASE_HASHER.copy()
+    hasher.update(raw_key.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _get_cached_key(key_hash: str) -> Tuple[bool, Optional[datetime]]:
+    """Return ``(hit, expires_at)`` for a key previously found active."""
+    now = time.monotonic()
+    with _key_cache_lock:
+        entry = _key_cache.get(key_hash)
+        if entry is None:
+            return False, None
+        cached_at, expires_at = entry
+        if now - cached_at >= API_KEY_CACHE_TTL_SECONDS:
+            del _key_cache[key_hash]
+            return False, None
+        _key_cache.move_to_end(key_hash)
+        return True, expires_at
+
+
+def _cache_key(key_hash: str, expires_at: Optional[datetime]) -> None:
+    with _key_cache_lock:
+        _key_cache[key_hash] = (time.monotonic(), expires_at)
+        _key_cache.move_to_end(key_hash)
+        while len(_key_cache) > _KEY_CACHE_MAX_ENTRIES:
+            _key_cache.popitem(last=False)
+
+
+def invalidate_api_key_cache() -> None:
+    """Forget cached key lookups and hashes (call after revoking or rotating keys)."""
+    with _key_cache_lock:
+        _key_cache.clear()
+    _hash_api_key.cache_clear()
 
 
 def _is_db_key_valid(db: Session, raw_key: str) -> bool:
+    """
+    Validate a key against the database.
+
+    Active keys are cached for ``API_KEY_CACHE_TTL_SECONDS``, so revocations
+    take up to one TTL to apply. Unknown keys are never cached: a key works as
+    soon as it is inserted. ``last_used_at`` is recorded through a background
+    batch writer instead of a per-request commit.
+    """
     key_hash = _hash_api_key(raw_key)
-    now = datetime.utcnow()
-    record = (
-        db.query(APIKeyModel)
-        .filter(APIKeyModel.key_hash == key_hash)
-        .filter(APIKeyModel.is_active.is_(True))
+    now = fast_utcnow()
+
+    hit, expires_at = _get_cached_key(key_hash)
+    if hit:
+        if expires_at and expires_at <= now:
+            return False
+        _last_used_writer.enqueue(key_hash, now)
+        return True
+
+    row = (
+        db.query(APIKeyModel.expires_at)
+        .filter(APIKeyModel.key_hash == key_hash, APIKeyModel.is_active.is_(True))
         .first()
     )
-    if not record:
+    if row is None:
         return False
-    if record.expires_at and record.expires_at <= now:
+    expires_at = row.expires_at
+    _cache_key(key_hash, expires_at)
+    if expires_at and expires_at <= now:
         return False
-    record.last_used_at = now
-    db.commit()
+    _last_used_writer.enqueue(key_hash, now)
     return True
 
 
@@ -48,7 +189,13 @@ def require_api_key(
         return
     if not api_key:
         raise HTTPException(status_code=401, detail="Missing API key")
-    if API_KEY and hmac.compare_digest(api_key, API_KEY):
+    presented = api_key.encode("utf-8")
+    # The server key's length is not secret, so skip compare_digest on mismatch.
+    if (
+        _API_KEY_BYTES
+        and len(presented) == len(_API_KEY_BYTES)
+        and hmac.compare_digest(presented, _API_KEY_BYTES)
+    ):
         return
     if _is_db_key_valid(db, api_key):
         return
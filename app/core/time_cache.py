@@ -0,0 +1,23 @@
+"""
+Low-resolution clock for hot request paths.
+"""
+import time
+from datetime import datetime
+from typing import Tuple
+
+_RESOLUTION_SECONDS = 0.1
+
+# (monotonic timestamp, utcnow at that moment)
+_cached: Tuple[float, datetime] = (float("-inf"), datetime.min)
+
+
+def fast_utcnow() -> datetime:
+    """Return ``datetime.utcnow()``, reusing the last value for up to 100ms."""
+    global _cached
+    now = time.monotonic()
+    cached_at, value = _cached
+    if now - cached_at < _RESOLUTION_SECONDS:
+        return value
+    value = datetime.utcnow()
+    _cached = (now, value)
+    return value
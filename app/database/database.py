@@ -2,16 +2,25 @@
 Database connection and session management.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from contextlib import contextmanager
+from typing import AsyncIterator
 import os
 
-from app.core.config import DEBUG, DATABASE_URL
+import orjson
+
+from app.core.config import DEBUG, DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_WARM
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+
+def _json_serializer(value) -> str:
+    """orjson for JSON/JSONB binds (chunk metadata may use non-str keys)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
 # Create engine
 if DATABASE_URL.startswith("sqlite"):
     # SQLite-specific configuration
@@ -19,18 +28,113 @@ if DATABASE_URL.startswith("sqlite"):
         DATABASE_URL,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
+        insertmanyvalues_page_size=500,
+        json_serializer=_json_serializer,
         echo=DEBUG,
     )
 else:
-    # PostgreSQL configuration
+    # PostgreSQL configuration: LIFO keeps the most recently used connection hot;
+    # recycle before server/proxy idle timeouts drop sockets.
     engine = create_engine(
         DATABASE_URL,
         pool_pre_ping=True,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_use_lifo=True,
+        insertmanyvalues_page_size=500,
+        json_serializer=_json_serializer,
         echo=DEBUG,
     )
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Session factory. Every column default is client-side, so committed objects
+# stay usable without being expired and reloaded on next attribute access.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Async engine for read paths in async handlers; built on first use so the
+# async drivers (asyncpg / aiosqlite) stay optional for sync-only callers.
+_async_engine = None
+_async_session_factory = None
+
+
+def _async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver."""
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return url
+    base = scheme.split("+", 1)[0]
+    if base == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if base in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+
+def get_async_engine():
+    """Return the shared async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        url = _async_database_url(DATABASE_URL)
+        if url.startswith("sqlite"):
+            _async_engine = create_async_engine(url, json_serializer=_json_serializer, echo=DEBUG)
+        else:
+            _async_engine = create_async_engine(
+                url,
+                pool_pre_ping=True,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_use_lifo=True,
+                json_serializer=_json_serializer,
+                echo=DEBUG,
+            )
+    return _async_engine
+
+
+def get_async_session_factory():
+    """Return the shared ``async_sessionmaker``."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+def warm_pool(count: int = DB_POOL_WARM) -> int:
+    """
+    Open ``count`` pooled connections and return them to the pool.
+
+    Moves TCP/TLS/auth handshakes off the first requests after startup.
+    No-op for SQLite, which uses a single static connection.
+    """
+    if engine.dialect.name == "sqlite" or count <= 0:
+        return 0
+    count = min(count, DB_POOL_SIZE)
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+async def warm_async_pool(count: int = DB_POOL_WARM) -> int:
+    """Async counterpart of ``warm_pool`` for the async engine."""
+    async_engine = get_async_engine()
+    if async_engine.dialect.name == "sqlite" or count <= 0:
+        return 0
+    count = min(count, DB_POOL_SIZE)
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(await async_engine.connect())
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
 
 
 def get_db():
@@ -42,6 +146,21 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Get async database session (for dependency injection)."""
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (called on shutdown)."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
+
+
 @contextmanager
 def get_db_context():
     """Context manager for database sessions."""
@@ -2,12 +2,12 @@
 SQLAlchemy database models for production-ready RAG service.
 """
 from datetime import datetime
-from uuid import uuid4
-from sqlalchemy import Column, String, Integer, Float, Text, DateTime, Date, ForeignKey, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, Date, ForeignKey, Boolean, Index, JSON, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from pgvector.sqlalchemy import Vector
+from app.core.ids import uuid7
+from app.database.types import FastVector
 
 Base = declarative_base()
 
@@ -16,7 +16,7 @@ class User(Base):
     """User model."""
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
@@ -33,7 +33,7 @@ class Document(Base):
     """Document metadata model."""
     __tablename__ = "documents"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     filename = Column(String(500), nullable=False)
     file_size = Column(Integer)
@@ -48,18 +48,24 @@ class Document(Base):
     user = relationship("User", back_populates="documents")
     chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Newest-first listing, optionally per user.
+        Index("ix_documents_created_at", created_at.desc()),
+        Index("ix_documents_user_created", user_id, created_at.desc()),
+    )
+
 
 class DocumentChunk(Base):
     """Document chunk with embedding stored in PostgreSQL."""
     __tablename__ = "document_chunks"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False, index=True)
     chunk_index = Column(Integer, nullable=False)
     content = Column(Text, nullable=False)  # Full chunk content
     content_preview = Column(Text)  # First 200 chars for preview
-    embedding = Column(Vector(1536))  # pgvector: 1536 dimensions for OpenAI embeddings
-    chunk_metadata = Column(Text)  # JSON metadata as text (renamed from 'metadata' to avoid SQLAlchemy conflict)
+    embedding = Column(FastVector(1536))  # pgvector: 1536 dimensions for OpenAI embeddings
+    chunk_metadata = Column(JSONB().with_variant(JSON(), "sqlite"))  # renamed from 'metadata' to avoid SQLAlchemy conflict
     source_type = Column(String(50), default="document", index=True)  # document, sec_filing
     form_type = Column(String(20), index=True)
     cik = Column(String(10), index=True)
@@ -71,12 +77,30 @@ class DocumentChunk(Base):
     # Relationships
     document = relationship("Document", back_populates="chunks")
 
+    __table_args__ = (
+        # Containment filters (chunk_metadata @> '{...}'); Postgres only.
+        Index(
+            "ix_document_chunks_metadata",
+            chunk_metadata,
+            postgresql_using="gin",
+            postgresql_ops={"chunk_metadata": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Embeddings are stored unit length, so inner product serves cosine
+        # search. The index is built over a halfvec cast: half the size of a
+        # float32 index; search re-ranks candidates with the full vectors.
+        Index(
+            "ix_document_chunks_embedding_hnsw",
+            text("(embedding::halfvec(1536)) halfvec_ip_ops"),
+            postgresql_using="hnsw",
+        ).ddl_if(dialect="postgresql"),
+    )
+
 
 class Query(Base):
     """Query history and analytics."""
     __tablename__ = "queries"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     question = Column(Text, nullable=False)
     answer = Column(Text)
@@ -91,12 +115,16 @@ class Query(Base):
     # Relationships
     user = relationship("User", back_populates="queries")
 
+    __table_args__ = (
+        Index("ix_queries_user_created", user_id, created_at.desc()),
+    )
+
 
 class APIKey(Base):
     """API key management."""
     __tablename__ = "api_keys"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     key_hash = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255))
@@ -114,7 +142,7 @@ class SECCompany(Base):
     """SEC company metadata."""
     __tablename__ = "sec_companies"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     cik = Column(String(10), unique=True, nullable=False, index=True)
     company_name = Column(String(255))
     ticker = Column(String(20))
@@ -130,7 +158,7 @@ class SECFiling(Base):
     """SEC filing metadata."""
     __tablename__ = "sec_filings"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     accession_number = Column(String(25), unique=True, nullable=False, index=True)
     company_id = Column(UUID(as_uuid=True), ForeignKey("sec_companies.id"), nullable=False, index=True)
     form_type = Column(String(20), nullable=False, index=True)
@@ -141,16 +169,22 @@ class SECFiling(Base):
     status = Column(String(20), default="discovered")  # discovered, downloading, indexing, indexed, failed
     filing_metadata = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     company = relationship("SECCompany", back_populates="filings")
     document = relationship("Document")
 
+    __table_args__ = (
+        # Newest-first listing; id breaks filed_date ties so pages stay stable.
+        Index("ix_sec_filings_filed_date_id", filed_date.desc(), id.desc()),
+    )
+
 
 class FilingCrossReference(Base):
     """Cross-references between filings."""
     __tablename__ = "filing_cross_references"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     source_filing_id = Column(UUID(as_uuid=True), ForeignKey("sec_filings.id"), nullable=False, index=True)
     target_accession_number = Column(String(25), nullable=False, index=True)
     target_filing_id = Column(UUID(as_uuid=True), ForeignKey("sec_filings.id"), nullable=True, index=True)
@@ -163,7 +197,7 @@ class SECIngestionJob(Base):
     """Background ingestion job for SEC filings."""
     __tablename__ = "sec_ingestion_jobs"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     cik = Column(String(10), nullable=False, index=True)
     accession_number = Column(String(25), nullable=False, index=True)
     form_type = Column(String(20), nullable=False)
@@ -177,3 +211,25 @@ class SECIngestionJob(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     started_at = Column(DateTime)
     finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # Only pending rows: stays tiny, and serves claim_next_pending's
+        # ORDER BY created_at LIMIT 1 ... SKIP LOCKED.
+        Index(
+            "ix_sec_jobs_pending_created_at",
+            created_at,
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
+
+
+class EmbeddingCache(Base):
+    """Cached embedding keyed by content hash, provider and model."""
+    __tablename__ = "embedding_cache"
+
+    content_hash = Column(String(64), primary_key=True)  # sha256 hex of the embedded text
+    provider = Column(String(50), primary_key=True)
+    model = Column(String(100), primary_key=True)
+    embedding = Column(FastVector(), nullable=False)  # dimension varies by model
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,16 +1,59 @@
 """
 Database repository layer for database operations.
 """
-from uuid import UUID, uuid4
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from datetime import datetime
+from uuid import UUID
+from typing import Optional, List, Dict, Any, Iterator, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy import Select, delete, desc, func, insert, lambda_stmt, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+import numpy as np
 
-from app.database.models import User, Document, DocumentChunk, Query, APIKey, SECIngestionJob
+from app.core.ids import uuid7
+from app.database import pg_copy
+from app.database.types import date_text
+from app.database.models import User, Document, DocumentChunk, Query, APIKey, SECIngestionJob, EmbeddingCache
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Row count from which chunk inserts switch from executemany to binary COPY.
+COPY_THRESHOLD = 100
+_COPY_COLUMNS = (
+    "id", "document_id", "chunk_index", "content", "content_preview", "embedding",
+    "chunk_metadata", "source_type", "form_type", "cik", "accession_number",
+    "filed_date", "filing_section", "created_at",
+)
+
+
+def split_total(rows: Sequence[Row], offset: int, columns: bool = False) -> Tuple[List[Any], Optional[int]]:
+    """Split rows from a ``count(*) OVER ()`` page query into ``(items, total)``.
+
+    Rows are ``(entity, total)``, or with ``columns=True`` plain column rows
+    ending in ``total``, returned as-is (attribute access still works).
+    ``total`` counts every row matching the filters, ignoring limit/offset.
+    An empty page past the end carries no total, so it is reported as None.
+    """
+    if not rows:
+        return [], None if offset else 0
+    if columns:
+        return list(rows), rows[0][-1]
+    return [row[0] for row in rows], rows[0][1]
+
+
+def l2_normalize(embeddings) -> np.ndarray:
+    """
+    Scale embedding(s) to unit length (float32).
+
+    Stored chunk vectors are unit length, so inner product equals cosine
+    similarity and search can use pgvector's ``<#>`` / ``vector_ip_ops`` index.
+    """
+    array = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    return array / np.maximum(norms, 1e-12)
+
 
 class DocumentRepository:
     """Repository for document operations."""
@@ -26,7 +69,7 @@ class DocumentRepository:
     ) -> Document:
         """Create a new document record."""
         document = Document(
-            id=uuid4(),
+            id=uuid7(),
             user_id=user_id,
             filename=filename,
             file_size=file_size,
@@ -36,7 +79,6 @@ class DocumentRepository:
         )
         db.add(document)
         db.commit()
-        db.refresh(document)
         logger.info(f"Created document: {document.id}")
         return document
     
@@ -61,26 +103,97 @@ class DocumentRepository:
             document.error_message = error_message
         
         db.commit()
-        db.refresh(document)
         return document
     
     @staticmethod
-    def get_document(db: Session, document_id: UUID) -> Optional[Document]:
-        """Get document by ID."""
-        return db.query(Document).filter(Document.id == document_id).first()
-    
+    def _get_document_stmt(document_id: UUID, with_chunks: bool = False) -> Select:
+        stmt = select(Document).where(Document.id == document_id)
+        if with_chunks:
+            stmt = stmt.options(selectinload(Document.chunks))
+        return stmt
+
+    @staticmethod
+    def _list_documents_stmt(
+        user_id: Optional[UUID],
+        limit: int,
+        offset: int,
+        after: Optional[datetime] = None,
+        with_total: bool = False,
+    ) -> StatementLambdaElement:
+        # lambda_stmt caches the compiled SQL per shape; values become binds.
+        if with_total:
+            stmt = lambda_stmt(lambda: select(Document, func.count().over()).options(raiseload("*")))
+        else:
+            stmt = lambda_stmt(lambda: select(Document).options(raiseload("*")))
+        if user_id:
+            stmt += lambda s: s.where(Document.user_id == user_id)
+        if after is not None:
+            stmt += lambda s: s.where(Document.created_at < after)
+        stmt += lambda s: s.order_by(desc(Document.created_at)).limit(limit).offset(offset)
+        return stmt
+
+    @staticmethod
+    def get_document(db: Session, document_id: UUID, with_chunks: bool = False) -> Optional[Document]:
+        """Get document by ID, optionally loading its chunks in the same round trip."""
+        return db.scalar(DocumentRepository._get_document_stmt(document_id, with_chunks))
+
+    @staticmethod
+    async def aget_document(db: AsyncSession, document_id: UUID, with_chunks: bool = False) -> Optional[Document]:
+        """Async version of ``get_document``."""
+        return await db.scalar(DocumentRepository._get_document_stmt(document_id, with_chunks))
+
     @staticmethod
     def list_documents(
         db: Session,
         user_id: Optional[UUID] = None,
         limit: int = 100,
         offset: int = 0,
+        after: Optional[datetime] = None,
     ) -> List[Document]:
-        """List documents."""
-        query = db.query(Document)
-        if user_id:
-            query = query.filter(Document.user_id == user_id)
-        return query.order_by(desc(Document.created_at)).limit(limit).offset(offset).all()
+        """
+        List documents, newest first (relationships raise rather than lazy-loading per row).
+
+        Pass the last row's ``created_at`` as ``after`` to page by keyset
+        instead of a deep ``offset``.
+        """
+        return list(db.scalars(DocumentRepository._list_documents_stmt(user_id, limit, offset, after)))
+
+    @staticmethod
+    async def alist_documents_page(
+        db: AsyncSession,
+        user_id: Optional[UUID] = None,
+        limit: int = 100,
+        offset: int = 0,
+        after: Optional[datetime] = None,
+    ) -> Tuple[List[Document], Optional[int]]:
+        """``list_documents`` plus the total match count, from the same query."""
+        stmt = DocumentRepository._list_documents_stmt(user_id, limit, offset, after, with_total=True)
+        return split_total((await db.execute(stmt)).all(), offset)
+
+    @staticmethod
+    async def adelete_document_rows(db: AsyncSession, document_id: UUID) -> int:
+        """
+        Delete a document and its chunks; returns the chunk count.
+
+        Does not commit, so the caller can still roll back (e.g. if deleting
+        the document's vectors elsewhere failed).
+        """
+        result = await db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+        await db.execute(delete(Document).where(Document.id == document_id))
+        return result.rowcount or 0
+
+    @staticmethod
+    async def acount_documents_and_chunks(db: AsyncSession) -> Dict[str, int]:
+        """Return document and chunk row counts in one round trip."""
+        row = (
+            await db.execute(
+                select(
+                    select(func.count(Document.id)).scalar_subquery(),
+                    select(func.count(DocumentChunk.id)).scalar_subquery(),
+                )
+            )
+        ).one()
+        return {"documents": row[0] or 0, "chunks": row[1] or 0}
 
 
 class DocumentChunkRepository:
@@ -95,34 +208,112 @@ class DocumentChunkRepository:
         embedding: List[float],
         metadata: Optional[Dict[str, Any]] = None,
     ) -> DocumentChunk:
-        """Create a document chunk record with embedding."""
-        import json
+        """Create a document chunk record with embedding.
+
+        Commits per row; ingest paths batch through ``insert_chunk_rows``.
+        """
         chunk = DocumentChunk(
-            id=uuid4(),
+            id=uuid7(),
             document_id=document_id,
             chunk_index=chunk_index,
             content=content,
             content_preview=content[:200] if content else None,
-            embedding=embedding,
-            chunk_metadata=json.dumps(metadata) if metadata else None,
+            embedding=l2_normalize(embedding),
+            chunk_metadata=metadata or None,
         )
         db.add(chunk)
         db.commit()
-        db.refresh(chunk)
         return chunk
     
+    @staticmethod
+    def insert_chunk_rows(db: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert prepared column dicts in a single commit.
+
+        From ``COPY_THRESHOLD`` rows on PostgreSQL/psycopg2 this uses binary
+        COPY; otherwise one executemany that SQLAlchemy batches into
+        multi-VALUES statements (see ``insertmanyvalues_page_size``). All rows
+        must share the same keys, and embeddings must already be unit length
+        (``l2_normalize``).
+        """
+        if not rows:
+            return 0
+        if len(rows) >= COPY_THRESHOLD and pg_copy.supports_binary_copy(db):
+            return DocumentChunkRepository.bulk_copy_chunks(db, rows)
+        db.execute(insert(DocumentChunk), rows)
+        db.commit()
+        return len(rows)
+
+    @staticmethod
+    def bulk_copy_chunks(
+        db: Session,
+        rows: List[Dict[str, Any]],
+        embeddings: Optional[np.ndarray] = None,
+    ) -> int:
+        """
+        Load prepared column dicts with binary COPY (PostgreSQL/psycopg2 only).
+
+        Takes the same row dicts as ``insert_chunk_rows``. When ``embeddings``
+        is given, row ``i`` uses ``embeddings[i]`` instead of its ``embedding``.
+        COPY bypasses column defaults, so they are applied here.
+        """
+        from datetime import datetime
+        if not rows:
+            return 0
+        wire_vectors = pg_copy.to_wire_vectors(embeddings) if embeddings is not None else None
+        created_field = pg_copy.encode_timestamp(datetime.utcnow())
+
+        def encoded_rows():
+            for i, row in enumerate(rows):
+                embedding = wire_vectors[i] if wire_vectors is not None else row.get("embedding")
+                yield (
+                    pg_copy.encode_uuid(row.get("id") or uuid7()),
+                    pg_copy.encode_uuid(row["document_id"]),
+                    pg_copy.encode_int4(row["chunk_index"]),
+                    pg_copy.encode_text(row["content"]),
+                    pg_copy.encode_text(row.get("content_preview")),
+                    pg_copy.encode_vector(embedding),
+                    pg_copy.encode_jsonb(row.get("chunk_metadata")),
+                    pg_copy.encode_text(row["source_type"] if "source_type" in row else "document"),
+                    pg_copy.encode_text(row.get("form_type")),
+                    pg_copy.encode_text(row.get("cik")),
+                    pg_copy.encode_text(row.get("accession_number")),
+                    pg_copy.encode_date(row.get("filed_date")),
+                    pg_copy.encode_text(row.get("filing_section")),
+                    created_field,
+                )
+
+        count = pg_copy.copy_binary(db, DocumentChunk.__tablename__, _COPY_COLUMNS, encoded_rows())
+        db.commit()
+        return count
+
     @staticmethod
     def get_chunks_by_document(
         db: Session,
         document_id: UUID,
-    ) -> List[DocumentChunk]:
-        """Get all chunks for a document."""
-        return (
-            db.query(DocumentChunk)
-            .filter(DocumentChunk.document_id == document_id)
+        batch_size: int = 200,
+    ) -> Iterator[DocumentChunk]:
+        """Stream all chunks for a document in ``batch_size`` batches.
+
+        Consume the result while ``db`` is still open.
+        """
+        stmt = (
+            select(DocumentChunk)
+            .where(DocumentChunk.document_id == document_id)
+            .order_by(DocumentChunk.chunk_index)
+            .execution_options(yield_per=batch_size)
+        )
+        return db.execute(stmt).scalars()
+
+    @staticmethod
+    async def aget_chunk_previews(db: AsyncSession, document_id: UUID) -> List[Row]:
+        """Get (id, chunk_index, content_preview) rows, skipping content and embeddings."""
+        stmt = (
+            select(DocumentChunk.id, DocumentChunk.chunk_index, DocumentChunk.content_preview)
+            .where(DocumentChunk.document_id == document_id)
             .order_by(DocumentChunk.chunk_index)
-            .all()
         )
+        return (await db.execute(stmt)).all()
     
     @staticmethod
     def delete_chunks_by_document(db: Session, document_id: UUID) -> int:
@@ -156,10 +347,11 @@ class QueryRepository:
         tokens_used: Optional[int] = None,
         user_id: Optional[UUID] = None,
         error_message: Optional[str] = None,
+        query_id: Optional[UUID] = None,
     ) -> Query:
-        """Create a query record."""
+        """Create a query record (``query_id`` lets the caller pre-assign the ID)."""
         query = Query(
-            id=uuid4(),
+            id=query_id or uuid7(),
             user_id=user_id,
             question=question,
             answer=answer,
@@ -172,27 +364,45 @@ class QueryRepository:
         )
         db.add(query)
         db.commit()
-        db.refresh(query)
         logger.info(f"Created query record: {query.id}")
         return query
     
+    @staticmethod
+    def _list_queries_stmt(
+        user_id: Optional[UUID],
+        limit: int,
+        offset: int,
+        after: Optional[datetime] = None,
+    ) -> StatementLambdaElement:
+        # lambda_stmt caches the compiled SQL per shape; values become binds.
+        stmt = lambda_stmt(lambda: select(Query).options(raiseload("*")))
+        if user_id:
+            stmt += lambda s: s.where(Query.user_id == user_id)
+        if after is not None:
+            stmt += lambda s: s.where(Query.created_at < after)
+        stmt += lambda s: s.order_by(desc(Query.created_at)).limit(limit).offset(offset)
+        return stmt
+
     @staticmethod
     def get_query(db: Session, query_id: UUID) -> Optional[Query]:
         """Get query by ID."""
-        return db.query(Query).filter(Query.id == query_id).first()
-    
+        return db.get(Query, query_id)
+
     @staticmethod
     def list_queries(
         db: Session,
         user_id: Optional[UUID] = None,
         limit: int = 100,
         offset: int = 0,
+        after: Optional[datetime] = None,
     ) -> List[Query]:
-        """List queries."""
-        query = db.query(Query)
-        if user_id:
-            query = query.filter(Query.user_id == user_id)
-        return query.order_by(desc(Query.created_at)).limit(limit).offset(offset).all()
+        """
+        List queries, newest first (relationships raise rather than lazy-loading per row).
+
+        Pass the last row's ``created_at`` as ``after`` to page by keyset
+        instead of a deep ``offset``.
+        """
+        return list(db.scalars(QueryRepository._list_queries_stmt(user_id, limit, offset, after)))
 
 
 class SECIngestionJobRepository:
@@ -218,7 +428,7 @@ class SECIngestionJobRepository:
                 filed_date_value = None
 
         job = SECIngestionJob(
-            id=uuid4(),
+            id=uuid7(),
             cik=cik,
             accession_number=accession_number,
             form_type=form_type,
@@ -229,13 +439,47 @@ class SECIngestionJobRepository:
         )
         db.add(job)
         db.commit()
-        db.refresh(job)
         return job
 
+    @staticmethod
+    def _list_columns() -> Tuple[Any, ...]:
+        job = SECIngestionJob
+        return (
+            job.id, job.cik, job.accession_number, job.form_type,
+            date_text(job.filed_date).label("filed_date"), job.status,
+            job.attempts, job.error_message, job.created_at, job.updated_at,
+        )
+
+    @staticmethod
+    def _list_jobs_stmt(
+        status: Optional[str],
+        limit: int,
+        offset: int,
+        after: Optional[datetime] = None,
+        with_total: bool = False,
+    ) -> StatementLambdaElement:
+        # lambda_stmt caches the compiled SQL per shape; values become binds.
+        if with_total:
+            # Plain columns for the listing; filed_date comes back as text.
+            stmt = lambda_stmt(lambda: select(*SECIngestionJobRepository._list_columns(), func.count().over()))
+        else:
+            stmt = lambda_stmt(lambda: select(SECIngestionJob).options(raiseload("*")))
+        if status:
+            stmt += lambda s: s.where(SECIngestionJob.status == status)
+        if after is not None:
+            stmt += lambda s: s.where(SECIngestionJob.created_at < after)
+        stmt += lambda s: s.order_by(desc(SECIngestionJob.created_at)).limit(limit).offset(offset)
+        return stmt
+
     @staticmethod
     def get_job(db: Session, job_id: UUID) -> Optional[SECIngestionJob]:
         """Get job by ID."""
-        return db.query(SECIngestionJob).filter(SECIngestionJob.id == job_id).first()
+        return db.get(SECIngestionJob, job_id)
+
+    @staticmethod
+    async def aget_job(db: AsyncSession, job_id: UUID) -> Optional[SECIngestionJob]:
+        """Async version of ``get_job``."""
+        return await db.get(SECIngestionJob, job_id)
 
     @staticmethod
     def list_jobs(
@@ -243,30 +487,64 @@ class SECIngestionJobRepository:
         status: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
+        after: Optional[datetime] = None,
     ) -> List[SECIngestionJob]:
-        """List jobs."""
-        query = db.query(SECIngestionJob)
-        if status:
-            query = query.filter(SECIngestionJob.status == status)
-        return query.order_by(desc(SECIngestionJob.created_at)).limit(limit).offset(offset).all()
+        """
+        List jobs, newest first (relationships raise rather than lazy-loading per row).
+
+        Pass the last row's ``created_at`` as ``after`` to page by keyset
+        instead of a deep ``offset``.
+        """
+        return list(db.scalars(SECIngestionJobRepository._list_jobs_stmt(status, limit, offset, after)))
+
+    @staticmethod
+    async def alist_jobs_page(
+        db: AsyncSession,
+        status: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[datetime] = None,
+    ) -> Tuple[List[Row], Optional[int]]:
+        """
+        ``list_jobs`` plus the total match count, from the same query.
+
+        Returns column rows (not ORM objects) with ``filed_date`` as
+        ``YYYY-MM-DD`` text, for serializing straight to JSON.
+        """
+        stmt = SECIngestionJobRepository._list_jobs_stmt(status, limit, offset, after, with_total=True)
+        return split_total((await db.execute(stmt)).all(), offset, columns=True)
 
     @staticmethod
     def claim_next_pending(db: Session) -> Optional[SECIngestionJob]:
-        """Claim the next pending job."""
+        """
+        Atomically claim the oldest pending job.
+
+        One ``UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING``
+        round trip, so concurrent workers never claim the same job (SQLite
+        ignores the lock clause; it serializes writers anyway).
+        """
         from datetime import datetime
-        job = (
-            db.query(SECIngestionJob)
-            .filter(SECIngestionJob.status == "pending")
+        next_pending = (
+            select(SECIngestionJob.id)
+            .where(SECIngestionJob.status == "pending")
             .order_by(SECIngestionJob.created_at)
-            .first()
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
         )
-        if not job:
-            return None
-        job.status = "running"
-        job.attempts = (job.attempts or 0) + 1
-        job.started_at = datetime.utcnow()
+        stmt = (
+            update(SECIngestionJob)
+            .where(SECIngestionJob.id == next_pending)
+            .values(
+                status="running",
+                attempts=func.coalesce(SECIngestionJob.attempts, 0) + 1,
+                started_at=datetime.utcnow(),
+            )
+            .returning(SECIngestionJob)
+            .execution_options(synchronize_session=False)
+        )
+        job = db.scalars(stmt).first()
         db.commit()
-        db.refresh(job)
         return job
 
     @staticmethod
@@ -276,7 +554,6 @@ class SECIngestionJobRepository:
         job.status = "completed"
         job.finished_at = datetime.utcnow()
         db.commit()
-        db.refresh(job)
         return job
 
     @staticmethod
@@ -287,5 +564,71 @@ class SECIngestionJobRepository:
         job.error_message = error_message
         job.finished_at = datetime.utcnow()
         db.commit()
-        db.refresh(job)
         return job
+
+
+class EmbeddingCacheRepository:
+    """Repository for cached embeddings."""
+
+    @staticmethod
+    def get_many(
+        db: Session,
+        content_hashes: List[str],
+        provider: str,
+        model: str,
+    ) -> Dict[str, List[float]]:
+        """Return ``{content_hash: embedding}`` for the hashes already cached."""
+        if not content_hashes:
+            return {}
+        stmt = select(EmbeddingCache.content_hash, EmbeddingCache.embedding).where(
+            EmbeddingCache.provider == provider,
+            EmbeddingCache.model == model,
+            EmbeddingCache.content_hash.in_(set(content_hashes)),
+        )
+        return {
+            content_hash: embedding.tolist() if hasattr(embedding, "tolist") else list(embedding)
+            for content_hash, embedding in db.execute(stmt)
+        }
+
+    @staticmethod
+    def put_many(
+        db: Session,
+        entries: Dict[str, List[float]],
+        provider: str,
+        model: str,
+    ) -> int:
+        """Insert new cache rows in one statement, ignoring ones that already exist."""
+        if not entries:
+            return 0
+        from datetime import datetime
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            dialect_insert = None
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "content_hash": content_hash,
+                "provider": provider,
+                "model": model,
+                "embedding": embedding,
+                "created_at": now,
+            }
+            for content_hash, embedding in entries.items()
+        ]
+        if dialect_insert is None:
+            db.execute(insert(EmbeddingCache), rows)
+        else:
+            # Multi-VALUES statements, paged to stay under bind-parameter limits.
+            for start in range(0, len(rows), 500):
+                db.execute(
+                    dialect_insert(EmbeddingCache)
+                    .values(rows[start:start + 500])
+                    .on_conflict_do_nothing()
+                )
+        db.commit()
+        return len(rows)
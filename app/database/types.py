@@ -0,0 +1,79 @@
+"""
+Column types shared by the models.
+"""
+from typing import Any, Optional
+
+import numpy as np
+import orjson
+from pgvector.sqlalchemy import VECTOR
+from sqlalchemy import String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+from app.core.config import VECTOR_FAST_SERIALIZE
+
+
+def vector_to_text(value: Any) -> Optional[str]:
+    """Render a vector in pgvector's text format (``[x,y,...]``) in one C call."""
+    if value is None or isinstance(value, str):
+        return value
+    # float32 first: orjson then emits the shortest round-tripping float32
+    # repr instead of the float64 expansion of each component.
+    array = np.asarray(value, dtype=np.float32)
+    return orjson.dumps(array, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+
+
+class FastVector(VECTOR):
+    """pgvector ``VECTOR`` that serializes through orjson instead of ``str()`` per float.
+
+    Used for the executemany insert path and query vectors; binary COPY
+    (``pg_copy``) never goes through bind processing. Set
+    ``VECTOR_FAST_SERIALIZE=false`` to fall back to pgvector's own encoder.
+    """
+
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        if not VECTOR_FAST_SERIALIZE:
+            return super().bind_processor(dialect)
+        return vector_to_text
+
+    def result_processor(self, dialect, coltype):
+        fallback = super().result_processor(dialect, coltype)
+        if not VECTOR_FAST_SERIALIZE:
+            return fallback
+
+        def process(value):
+            # The text format is a JSON array of numbers.
+            if isinstance(value, str):
+                return orjson.loads(value)
+            return fallback(value)
+
+        return process
+
+
+class date_text(FunctionElement):
+    """A ``Date`` column rendered as ``YYYY-MM-DD`` text by the database.
+
+    Rows then arrive as ready-to-serialize strings, with no ``date`` object
+    built per row by the driver. Same text as ``date.isoformat()``.
+    """
+
+    type = String()
+    inherit_cache = True
+
+
+@compiles(date_text)
+def _date_text_default(element, compiler, **kw):
+    return f"CAST({compiler.process(element.clauses, **kw)} AS VARCHAR)"
+
+
+@compiles(date_text, "postgresql")
+def _date_text_postgresql(element, compiler, **kw):
+    return f"to_char({compiler.process(element.clauses, **kw)}, 'YYYY-MM-DD')"
+
+
+@compiles(date_text, "sqlite")
+def _date_text_sqlite(element, compiler, **kw):
+    # SQLite already stores dates as ISO text.
+    return compiler.process(element.clauses, **kw)
@@ -1,12 +1,17 @@
 """
 FastAPI application entry point.
 """
-import uuid
+import asyncio
+import functools
+import itertools
+import math
+import secrets
 from pathlib import Path
 from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 
 from app.core.config import (
     APP_NAME,
@@ -19,20 +24,40 @@ from app.core.config import (
     RATE_LIMIT_ENABLED,
     RATE_LIMIT_REQUESTS,
     RATE_LIMIT_WINDOW_SECONDS,
+    RATE_LIMIT_SHARDS,
+    RATE_LIMIT_STRATEGY,
+    RATE_LIMIT_REDIS_URL,
 )
 from app.core.logging_config import setup_logging, get_logger
 from app.core.exceptions import RAGServiceError
 from app.routes import ask_router, documents_router, rag_router, sec_router
 from app.core.security import require_api_key
-from app.core.rate_limiter import RateLimiter
+from app.core.rate_limiter import RateLimiter, RedisRateLimiter
+from app.core.executors import shutdown_pools
+from app.core.http_pool import close_async_http_client
+from app.database.database import dispose_async_engine, warm_async_pool, warm_pool
+from app.services.llm_router import close_clients
+from app.services.sec.edgar_client import EdgarClient
 
 # Setup logging first
 setup_logging(log_level=LOG_LEVEL, json_output=LOG_JSON)
 logger = get_logger(__name__)
-rate_limiter = RateLimiter(
-    max_requests=RATE_LIMIT_REQUESTS,
-    window_seconds=RATE_LIMIT_WINDOW_SECONDS,
-)
+if RATE_LIMIT_REDIS_URL:
+    # Shared limit across uvicorn workers/replicas.
+    rate_limiter = RedisRateLimiter(
+        redis_url=RATE_LIMIT_REDIS_URL,
+        max_requests=RATE_LIMIT_REQUESTS,
+        window_seconds=RATE_LIMIT_WINDOW_SECONDS,
+    )
+else:
+    rate_limiter = RateLimiter(
+        max_requests=RATE_LIMIT_REQUESTS,
+        window_seconds=RATE_LIMIT_WINDOW_SECONDS,
+        shards=RATE_LIMIT_SHARDS,
+        strategy=RATE_LIMIT_STRATEGY,
+    )
+# The Redis limiter is async (network round trip); the in-process one is not.
+_rate_limiter_is_async = isinstance(rate_limiter, RedisRateLimiter)
 
 
 @asynccontextmanager
@@ -40,9 +65,25 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     logger.info(f"Starting {APP_NAME} v{APP_VERSION}")
+    _render_ui()
+    try:
+        warmed = await asyncio.to_thread(warm_pool)
+        warmed_async = await warm_async_pool()
+        if warmed or warmed_async:
+            logger.info(f"Warmed database pools: {warmed} sync, {warmed_async} async connections")
+    except Exception as e:
+        # Requests fall back to connecting lazily.
+        logger.warning(f"Database pool warm-up failed: {e}")
     yield
     # Shutdown
     logger.info(f"Shutting down {APP_NAME}")
+    await close_clients()
+    await close_async_http_client()
+    await EdgarClient.aclose()
+    await dispose_async_engine()
+    if _rate_limiter_is_async:
+        await rate_limiter.close()
+    shutdown_pools()
 
 
 # Create FastAPI app
@@ -51,6 +92,7 @@ app = FastAPI(
     version=APP_VERSION,
     debug=DEBUG,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 UI_INDEX_PATH = Path(__file__).resolve().parent / "ui" / "index.html"
@@ -65,11 +107,17 @@ app.add_middleware(
 )
 
 
+# Request IDs: per-process random prefix + counter, unique across workers
+# without a urandom read and UUID formatting per request.
+_REQUEST_ID_PREFIX = secrets.token_hex(4)
+_request_counter = itertools.count(1)
+
+
 # Request ID middleware
 @app.middleware("http")
 async def add_request_id(request: Request, call_next):
     """Add request ID to all requests for tracing."""
-    request_id = str(uuid.uuid4())
+    request_id = f"{_REQUEST_ID_PREFIX}-{next(_request_counter):x}"
     request.state.request_id = request_id
     
     response = await call_next(request)
@@ -77,24 +125,39 @@ async def add_request_id(request: Request, call_next):
     return response
 
 
-@app.middleware("http")
+# Health probes, landing page and static UI are never rate limited.
+_RATE_LIMIT_EXEMPT_PATHS = frozenset({"/health", "/", "/ui"})
+
+
 async def enforce_rate_limit(request: Request, call_next):
-    if RATE_LIMIT_ENABLED and request.url.path not in {"/health", "/"}:
-        api_key = request.headers.get("X-API-Key") or ""
-        client_host = request.client.host if request.client else "unknown"
-        identifier = f"{api_key}:{client_host}" if api_key else client_host
-        if not rate_limiter.allow(identifier):
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "success": False,
-                    "error": {"message": "Rate limit exceeded"},
-                    "request_id": getattr(request.state, "request_id", None),
-                },
-            )
+    # scope["path"] avoids building a URL object per request.
+    if request.scope["path"] in _RATE_LIMIT_EXEMPT_PATHS:
+        return await call_next(request)
+    api_key = request.headers.get("X-API-Key")
+    client_host = request.client.host if request.client else "unknown"
+    identifier = api_key + ":" + client_host if api_key else client_host
+    if _rate_limiter_is_async:
+        allowed, retry_after = await rate_limiter.check(identifier)
+    else:
+        allowed, retry_after = rate_limiter.check(identifier)
+    if not allowed:
+        return ORJSONResponse(
+            status_code=429,
+            content={
+                "success": False,
+                "error": {"code": "agent.rate_limited", "message": "Rate limit exceeded"},
+                "request_id": getattr(request.state, "request_id", None),
+            },
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
     return await call_next(request)
 
 
+# Only installed when enabled, so disabled deployments pay nothing per request.
+if RATE_LIMIT_ENABLED:
+    app.middleware("http")(enforce_rate_limit)
+
+
 # Exception handlers
 @app.exception_handler(RAGServiceError)
 async def rag_service_error_handler(request: Request, exc: RAGServiceError):
@@ -108,7 +171,7 @@ async def rag_service_error_handler(request: Request, exc: RAGServiceError):
         }
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -131,7 +194,7 @@ async def general_exception_handler(request: Request, exc: Exception):
         extra={"request_id": request_id}
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -173,11 +236,21 @@ async def root():
     }
 
 
+@functools.lru_cache(maxsize=1)
+def _render_ui() -> Optional[bytes]:
+    """Read and render the UI page once; ``None`` if it is not bundled."""
+    try:
+        raw = UI_INDEX_PATH.read_bytes()
+    except FileNotFoundError:
+        logger.warning(f"UI not found at {UI_INDEX_PATH}; /ui will return 404")
+        return None
+    return raw.replace(b"{{DEBUG}}", b"true" if DEBUG else b"false")
+
+
 @app.get("/ui", include_in_schema=False)
 async def ui():
     """Minimal UI for prompt and SEC sources."""
-    if not UI_INDEX_PATH.exists():
+    html = _render_ui()
+    if html is None:
         raise HTTPException(status_code=404, detail="UI not found")
-    html = UI_INDEX_PATH.read_text(encoding="utf-8")
-    html = html.replace("{{DEBUG}}", "true" if DEBUG else "false")
     return HTMLResponse(html)
@@ -8,13 +8,35 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.services.llm_router import get_llm_client
-from app.core.responses import APIResponse, LLMCompletionResponse, StreamingChunk
+from app.services.embeddings.embedding_router import get_embedding_model
+from app.services.semantic_cache import SemanticCache
+from app.core.config import (
+    LLM_PROVIDER,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL_SECONDS,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_MAX_TEMPERATURE,
+)
+from app.core.responses import (
+    APIResponse,
+    LLMCompletionResponse,
+    SSEFrameEncoder,
+    StreamingChunk,
+    StreamingChunkSchema,
+    chunk_json,
+)
 from app.core.exceptions import ValidationError
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/ask", tags=["ask"])
+semantic_cache = SemanticCache(
+    threshold=SEMANTIC_CACHE_THRESHOLD,
+    ttl_seconds=SEMANTIC_CACHE_TTL_SECONDS,
+    max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+)
 
 
 class AskRequest(BaseModel):
@@ -27,6 +49,25 @@ class AskRequest(BaseModel):
     stream: bool = Field(False, description="Enable streaming response")
 
 
+def _cache_scope(request: AskRequest) -> str:
+    # Only prompts asked under the same provider/system prompt/limit may share answers.
+    return f"{request.provider or LLM_PROVIDER}\x1f{request.system_prompt or ''}\x1f{request.max_tokens}"
+
+
+async def _embed_prompt(prompt: str):
+    """Embed a prompt for the semantic cache; ``None`` disables caching for this request."""
+    try:
+        embedding_model = get_embedding_model()
+        if hasattr(embedding_model, "embed_async"):
+            embedding = await embedding_model.embed_async(prompt)
+        else:
+            embedding = embedding_model.embed(prompt)
+        return SemanticCache.normalize(embedding)
+    except Exception as e:
+        logger.warning(f"Semantic cache embedding failed: {e}")
+        return None
+
+
 @router.post("", response_model=APIResponse)
 async def ask(request: AskRequest, http_request: Request):
     """
@@ -48,16 +89,30 @@ async def ask(request: AskRequest, http_request: Request):
     )
     
     try:
-        # Get LLM client
-        llm_client = get_llm_client(provider=request.provider)
+        prompt_vector = None
+        cache_scope = None
+        response = None
+        if SEMANTIC_CACHE_ENABLED and request.temperature <= SEMANTIC_CACHE_MAX_TEMPERATURE:
+            prompt_vector = await _embed_prompt(request.prompt)
+            if prompt_vector is not None:
+                cache_scope = _cache_scope(request)
+                response = semantic_cache.lookup(cache_scope, prompt_vector)
+                if response is not None:
+                    logger.info("Semantic cache hit", extra={"request_id": request_id})
         
-        # Make request
-        response = llm_client.ask(
-            prompt=request.prompt,
-            system_prompt=request.system_prompt,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens,
-        )
+        if response is None:
+            # Get LLM client
+            llm_client = get_llm_client(provider=request.provider)
+            
+            # Make request
+            response = llm_client.ask(
+                prompt=request.prompt,
+                system_prompt=request.system_prompt,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+            )
+            if cache_scope is not None:
+                semantic_cache.add(cache_scope, prompt_vector, response)
         
         latency_ms = (time.time() - start_time) * 1000
         
@@ -81,7 +136,7 @@ async def ask(request: AskRequest, http_request: Request):
                 usage=response.usage,
                 finish_reason=response.finish_reason,
                 latency_ms=latency_ms,
-            ).dict(),
+            ).model_dump(),
             request_id=request_id,
         )
         
@@ -94,7 +149,10 @@ async def ask(request: AskRequest, http_request: Request):
         raise
 
 
-@router.post("/stream")
+@router.post(
+    "/stream",
+    responses={200: {"model": StreamingChunkSchema, "description": "SSE stream of StreamingChunk frames"}},
+)
 async def ask_stream(request: AskRequest, http_request: Request):
     """
     LLM completion endpoint with streaming.
@@ -119,8 +177,7 @@ async def ask_stream(request: AskRequest, http_request: Request):
         # Streaming generator
         async def generate():
             try:
-                model_name = None
-                provider_name = None
+                frames = None
                 
                 async for chunk in llm_client.stream_async(
                     prompt=request.prompt,
@@ -128,26 +185,12 @@ async def ask_stream(request: AskRequest, http_request: Request):
                     temperature=request.temperature,
                     max_tokens=request.max_tokens,
                 ):
-                    if model_name is None:
-                        model_name = llm_client.model
-                        provider_name = llm_client.provider_name
-                    
-                    chunk_data = StreamingChunk(
-                        content=chunk,
-                        done=False,
-                        model=model_name,
-                        provider=provider_name,
-                    )
-                    yield f"data: {chunk_data.json()}\n\n"
+                    if frames is None:
+                        frames = SSEFrameEncoder(llm_client.model, llm_client.provider_name)
+                    yield frames.token(chunk)
                 
                 # Final chunk
-                final_chunk = StreamingChunk(
-                    content="",
-                    done=True,
-                    model=model_name,
-                    provider=provider_name,
-                )
-                yield f"data: {final_chunk.json()}\n\n"
+                yield (frames or SSEFrameEncoder(None, None)).done()
                 
             except Exception as e:
                 logger.error(
@@ -159,7 +202,7 @@ async def ask_stream(request: AskRequest, http_request: Request):
                     content=f"Error: {str(e)}",
                     done=True,
                 )
-                yield f"data: {error_chunk.json()}\n\n"
+                yield b"data: " + chunk_json(error_chunk) + b"\n\n"
         
         return StreamingResponse(
             generate(),
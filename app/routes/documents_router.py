@@ -1,43 +1,107 @@
 """
 Document upload and management endpoints.
 """
-import uuid
-from typing import List, Optional
+import asyncio
+import codecs
+import functools
+import hashlib
+from datetime import datetime
+from typing import BinaryIO, List, Optional, Tuple
 from fastapi import APIRouter, Request, UploadFile, File, HTTPException, Form, Depends
-from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.services.document_processor.parsers import parse_document
-from app.services.document_processor.processor import DocumentProcessor, DocumentChunk
+from app.services.document_processor.parsers import PDFParser, parse_document
+from app.services.document_processor.processor import DocumentProcessor
 from app.services.embeddings.embedding_router import get_embedding_model
+from app.services.embeddings.embedding_cache import get_or_compute_embeddings_async
 from app.services.vector_store.vector_store_router import get_vector_store
 from app.services.vector_store.base import Document as VectorDocument
-from app.database.database import get_db
-from app.database.repositories import DocumentRepository, DocumentChunkRepository
-from app.core.responses import APIResponse
-from app.core.config import MAX_UPLOAD_SIZE_MB
+from app.database.database import get_async_db, get_db
+from app.database.repositories import DocumentChunkRepository, DocumentRepository
+from app.core.responses import APIResponse, api_response, record_columns, record_dicts
+from app.core.config import MAX_UPLOAD_SIZE_MB, PDF_PARALLEL_MIN_BYTES, PDF_PARSE_PROCESSES
+from app.core.executors import get_pdf_pool, run_upload_work
+from app.core.ids import parse_uuid
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 MAX_UPLOAD_BYTES = MAX_UPLOAD_SIZE_MB * 1024 * 1024
+UPLOAD_READ_CHUNK_BYTES = 64 * 1024
 ALLOWED_EXTENSIONS = {".pdf", ".txt", ".md", ".markdown"}
+_DOCUMENT_LIST_FIELDS = ("id", "filename", "file_size", "file_type", "status", "chunks_count", "created_at")
+_CHUNK_PREVIEW_FIELDS = ("id", "chunk_index", "content_preview")
 
 
-def _validate_upload(filename: str, content_type: Optional[str], content: bytes) -> None:
-    extension = (filename or "").lower()
-    ext = None
-    if "." in extension:
-        ext = extension[extension.rfind("."):]
+def _upload_extension(filename: Optional[str]) -> Optional[str]:
+    _, dot, suffix = (filename or "").rpartition(".")
+    # Lower-case only the extension, not the whole filename.
+    return "." + suffix.lower() if dot else None
+
+
+def _is_pdf(ext: Optional[str], content_type: Optional[str]) -> bool:
+    return ext == ".pdf" or bool(content_type and "pdf" in content_type.lower())
+
+
+async def _scan_upload(file: UploadFile) -> Tuple[int, str, Optional[str]]:
+    """
+    Validate, hash and (for text files) decode the upload in one pass.
+    
+    Reads fixed-size chunks, so the file is never buffered in memory as a
+    whole; the type check runs on the first chunk and 413 is raised as soon
+    as the size limit is crossed. Returns (total size, sha256 hex, decoded
+    text). Text is None for PDFs, or if the file is not valid UTF-8, in
+    which case the upload is rewound for ``parse_document``.
+    """
+    digest = hashlib.sha256()
+    decoder = None
+    parts: List[str] = []
+    size = 0
+    while chunk := await file.read(UPLOAD_READ_CHUNK_BYTES):
+        if not size:
+            ext = _upload_extension(file.filename)
+            _validate_upload(ext, file.content_type, chunk)
+            if not _is_pdf(ext, file.content_type):
+                decoder = codecs.getincrementaldecoder("utf-8")()
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="File too large")
+        digest.update(chunk)
+        if decoder is not None:
+            try:
+                parts.append(decoder.decode(chunk))
+            except UnicodeDecodeError:
+                # Leave lenient decoding to the parser.
+                decoder = None
+                parts = []
+    if not size:
+        _validate_upload(_upload_extension(file.filename), file.content_type, b"")
+    if decoder is not None:
+        try:
+            parts.append(decoder.decode(b"", final=True))
+            return size, digest.hexdigest(), "".join(parts)
+        except UnicodeDecodeError:
+            pass
+    await file.seek(0)
+    return size, digest.hexdigest(), None
+
+
+def _parse_pdf_parallel(stream: BinaryIO) -> str:
+    # Worker processes need the bytes; the spooled file cannot be shared.
+    return PDFParser.parse_parallel(stream.read(), get_pdf_pool(), PDF_PARSE_PROCESSES)
+
+
+def _validate_upload(ext: Optional[str], content_type: Optional[str], content: bytes) -> None:
     if ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Unsupported file type")
-    if ext == ".pdf" or (content_type and "pdf" in content_type.lower()):
+    if _is_pdf(ext, content_type):
         if not content.startswith(b"%PDF-"):
-            raise HTTPException(status_code=400, detail="Invalid PDF file")
+            raise HTTPException(status_code=415, detail="Invalid PDF file")
     else:
         # Basic binary check for text/markdown
-        if b"\x00" in content[:1024]:
+        if content.find(b"\x00", 0, 1024) != -1:
             raise HTTPException(status_code=400, detail="Invalid text file")
 
 # Initialize document processor
@@ -48,12 +112,14 @@ document_processor = DocumentProcessor(
 )
 
 
-class DocumentUploadResponse(BaseModel):
-    """Response for document upload."""
-    document_id: str
-    chunks_created: int
-    total_chunks: int
-    metadata: dict
+@functools.lru_cache(maxsize=16)
+def _get_processor(chunk_size: int, chunk_overlap: int, chunk_strategy: str) -> DocumentProcessor:
+    """Shared processor per chunking config (DocumentProcessor holds no per-call state)."""
+    return DocumentProcessor(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        chunk_strategy=chunk_strategy,
+    )
 
 
 @router.post("/upload", response_model=APIResponse)
@@ -76,7 +142,7 @@ async def upload_document(
         "Document upload request",
         extra={
             "request_id": request_id,
-            "filename": file.filename,
+            "upload_filename": file.filename,
             "content_type": file.content_type,
         }
     )
@@ -84,63 +150,69 @@ async def upload_document(
     # Create document record in PostgreSQL
     db_document = None
     try:
-        # Read file content with size limit
-        content = await file.read(MAX_UPLOAD_BYTES + 1)
-        if len(content) > MAX_UPLOAD_BYTES:
-            raise HTTPException(status_code=413, detail="File too large")
-        _validate_upload(file.filename, file.content_type, content)
+        # Validate, size-check, hash and decode text in a single pass
+        file_size, content_sha256, text_content = await _scan_upload(file)
         
-        # Parse document
-        text_content = parse_document(file_path=file.filename, content=content)
+        if text_content is None and file_size > PDF_PARALLEL_MIN_BYTES and PDF_PARSE_PROCESSES > 1 \
+                and _is_pdf(_upload_extension(file.filename), file.content_type):
+            # Large PDFs: extract page ranges across the process pool
+            text_content = await run_upload_work(_parse_pdf_parallel, file.file)
+        elif text_content is None:
+            # PDFs (and non-UTF-8 text) parse from the spooled upload, off the event loop
+            text_content = await run_upload_work(parse_document, file_path=file.filename, stream=file.file)
         
         if not text_content.strip():
             raise HTTPException(status_code=400, detail="Document appears to be empty")
         
         # Extract metadata
-        metadata = document_processor.extract_metadata(
+        metadata = await run_upload_work(
+            document_processor.extract_metadata,
             file_path=file.filename,
             content=text_content,
         )
         metadata["upload_filename"] = file.filename
         metadata["content_type"] = file.content_type
+        metadata["content_sha256"] = content_sha256
         
         # Create document record in PostgreSQL
         db_document = DocumentRepository.create_document(
             db=db,
             filename=file.filename,
-            file_size=len(content),
+            file_size=file_size,
             file_type=file.content_type,
             status="processing",
         )
         
         # Process into chunks
-        processor = DocumentProcessor(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            chunk_strategy="sentence",
+        processor = _get_processor(chunk_size, chunk_overlap, "sentence")
+        # document_id goes into the base metadata so each chunk's dict is built once
+        chunks = await run_upload_work(
+            processor.process_text,
+            text_content,
+            metadata={**metadata, "document_id": str(db_document.id)},
         )
-        chunks = processor.process_text(text_content, metadata=metadata)
         
         # Generate embeddings
         embedding_model = get_embedding_model()
         texts = [chunk.content for chunk in chunks]
-        embeddings = embedding_model.embed(texts)
+        embeddings = await get_or_compute_embeddings_async(texts, embedding_model)
         
-        # Create vector documents with embeddings
-        vector_documents = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            chunk_id = f"{db_document.id}_chunk_{i}"
-            vector_doc = VectorDocument(
-                id=chunk_id,
+        # Create vector documents with embeddings. The fields are already
+        # validated, so model_construct skips re-copying each chunk's
+        # metadata dict and embedding list.
+        vector_documents = [
+            VectorDocument.model_construct(
+                id=f"{db_document.id}_chunk_{i}",
                 content=chunk.content,
-                metadata={**chunk.metadata, "document_id": str(db_document.id), "chunk_index": i},
+                metadata=chunk.metadata,
                 embedding=embedding,
             )
-            vector_documents.append(vector_doc)
+            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+        ]
         
         # Store in vector database (PostgreSQL with pgvector)
         vector_store = get_vector_store()
-        vector_store.add_documents(vector_documents)
+        vector_store.add_documents_bulk(vector_documents)
         
         # Update document status and chunk count
         DocumentRepository.update_document(
@@ -159,14 +231,13 @@ async def upload_document(
             }
         )
         
-        return APIResponse(
-            success=True,
-            data=DocumentUploadResponse(
-                document_id=str(db_document.id),
-                chunks_created=len(chunks),
-                total_chunks=len(chunks),
-                metadata=metadata,
-            ).dict(),
+        return api_response(
+            {
+                "document_id": str(db_document.id),
+                "chunks_created": len(chunks),
+                "total_chunks": len(chunks),
+                "metadata": metadata,
+            },
             request_id=request_id,
         )
         
@@ -183,6 +254,10 @@ async def upload_document(
             except:
                 pass
         
+        if isinstance(e, HTTPException):
+            # Rejected uploads (type, size, empty) keep their status code.
+            raise
+        
         logger.error(
             f"Document upload failed: {str(e)}",
             extra={"request_id": request_id},
@@ -194,18 +269,14 @@ async def upload_document(
 @router.get("/count", response_model=APIResponse)
 async def get_document_count(
     http_request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get total number of documents and chunks."""
     request_id = getattr(http_request.state, "request_id", None)
     
     try:
         # Get counts from PostgreSQL
-        from sqlalchemy import func
-        from app.database.models import Document, DocumentChunk
-        
-        doc_count = db.query(func.count(Document.id)).scalar() or 0
-        chunk_count = db.query(func.count(DocumentChunk.id)).scalar() or 0
+        counts = await DocumentRepository.acount_documents_and_chunks(db)
         
         # Also get vector store count for comparison
         vector_store = get_vector_store()
@@ -214,8 +285,8 @@ async def get_document_count(
         return APIResponse(
             success=True,
             data={
-                "documents": doc_count,
-                "chunks_postgres": chunk_count,
+                "documents": counts["documents"],
+                "chunks_postgres": counts["chunks"],
                 "chunks_vector_store": vector_count,
             },
             request_id=request_id,
@@ -230,35 +301,37 @@ async def list_documents(
     http_request: Request,
     limit: int = 20,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    after: Optional[datetime] = None,
+    columnar: bool = False,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List uploaded documents."""
+    """
+    List uploaded documents (pass ``next_after`` back as ``after`` for the next page).
+    
+    With ``columnar=true``, ``documents`` is ``{field: [values...]}`` instead
+    of a list of objects.
+    """
     request_id = getattr(http_request.state, "request_id", None)
     
     try:
-        documents = DocumentRepository.list_documents(
+        documents, total = await DocumentRepository.alist_documents_page(
             db=db,
             limit=limit,
             offset=offset,
+            after=after,
         )
         
-        return APIResponse(
-            success=True,
-            data={
-                "documents": [
-                    {
-                        "id": str(doc.id),
-                        "filename": doc.filename,
-                        "file_size": doc.file_size,
-                        "file_type": doc.file_type,
-                        "status": doc.status,
-                        "chunks_count": doc.chunks_count,
-                        "created_at": doc.created_at.isoformat() if doc.created_at else None,
-                    }
-                    for doc in documents
-                ],
+        return api_response(
+            {
+                "documents": (record_columns if columnar else record_dicts)(documents, _DOCUMENT_LIST_FIELDS),
+                "total": total,
                 "limit": limit,
                 "offset": offset,
+                "next_after": (
+                    documents[-1].created_at.isoformat()
+                    if len(documents) == limit and documents[-1].created_at
+                    else None
+                ),
             },
             request_id=request_id,
         )
@@ -267,16 +340,44 @@ async def list_documents(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{document_id}/chunks", response_model=APIResponse)
+async def list_document_chunks(
+    document_id: str,
+    http_request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List a document's chunk previews in order (no full content or embeddings)."""
+    request_id = getattr(http_request.state, "request_id", None)
+    
+    doc_uuid = parse_uuid(document_id)
+    if doc_uuid is None:
+        raise HTTPException(status_code=400, detail="Invalid document id")
+    
+    chunks = await DocumentChunkRepository.aget_chunk_previews(db=db, document_id=doc_uuid)
+    if not chunks and not await DocumentRepository.aget_document(db=db, document_id=doc_uuid):
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    return api_response(
+        {
+            "document_id": doc_uuid,
+            "chunks": record_dicts(chunks, _CHUNK_PREVIEW_FIELDS),
+        },
+        request_id=request_id,
+    )
+
+
 @router.delete("/{document_id}", response_model=APIResponse)
 async def delete_document(
     document_id: str,
     http_request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Delete a document and all its chunks.
     
-    Note: This deletes metadata from PostgreSQL and chunks from ChromaDB.
+    The vector-store delete and the PostgreSQL deletes run concurrently; the
+    PostgreSQL transaction only commits once the vectors are gone, so a
+    failed delete can simply be retried.
     """
     request_id = getattr(http_request.state, "request_id", None)
     
@@ -285,30 +386,33 @@ async def delete_document(
         extra={"request_id": request_id, "document_id": document_id}
     )
     
+    doc_uuid = parse_uuid(document_id)
+    if doc_uuid is None:
+        raise HTTPException(status_code=400, detail="Invalid document id")
+    
     try:
-        from uuid import UUID
-        doc_uuid = UUID(document_id)
-        
         # Get document
-        document = DocumentRepository.get_document(db=db, document_id=doc_uuid)
+        document = await DocumentRepository.aget_document(db=db, document_id=doc_uuid)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
-        # Get all chunk IDs
-        chunks = DocumentChunkRepository.get_chunks_by_document(db=db, document_id=doc_uuid)
-        chunk_ids = [chunk.vector_chunk_id for chunk in chunks]
-        
-        # Delete from vector store
-        if chunk_ids:
+        # Vector IDs follow the scheme used at upload/ingest time
+        vector_ids = [f"{doc_uuid}_chunk_{i}" for i in range(document.chunks_count or 0)]
+        delete_rows = DocumentRepository.adelete_document_rows(db=db, document_id=doc_uuid)
+        if vector_ids:
             vector_store = get_vector_store()
-            vector_store.delete(chunk_ids)
-        
-        # Delete chunks from PostgreSQL
-        DocumentChunkRepository.delete_chunks_by_document(db=db, document_id=doc_uuid)
+            vectors_deleted, _ = await asyncio.gather(
+                asyncio.to_thread(vector_store.delete, vector_ids),
+                delete_rows,
+            )
+        else:
+            vectors_deleted = True
+            await delete_rows
         
-        # Delete document from PostgreSQL
-        db.delete(document)
-        db.commit()
+        if not vectors_deleted:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail="Failed to delete document vectors")
+        await db.commit()
         
         logger.info(f"Deleted document: {document_id}")
         
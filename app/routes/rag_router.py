@@ -1,16 +1,18 @@
 """
 RAG query endpoints.
 """
+import asyncio
+import functools
 import time
 from typing import Optional, Dict, Any
 from datetime import date
-from fastapi import APIRouter, Request, Depends
+from fastapi import APIRouter, BackgroundTasks, Request
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
 
 from app.services.rag.pipeline import RAGPipeline
 from app.core.config import LLM_PROVIDER
-from app.database.database import get_db
+from app.core.ids import uuid7
+from app.database.database import SessionLocal
 from app.database.repositories import QueryRepository
 from app.core.responses import APIResponse
 from app.core.logging_config import get_logger
@@ -23,6 +25,17 @@ router = APIRouter(prefix="/rag", tags=["rag"])
 rag_pipeline = RAGPipeline(top_k=5, context_window=4000)
 
 
+def _log_query(**fields: Any) -> None:
+    """Write a query analytics row on its own session (runs after the response)."""
+    db = SessionLocal()
+    try:
+        QueryRepository.create_query(db=db, **fields)
+    except Exception as e:
+        logger.warning(f"Failed to log query: {e}")
+    finally:
+        db.close()
+
+
 class RAGQueryRequest(BaseModel):
     """Request model for RAG query."""
     question: str = Field(..., min_length=1, max_length=5000, description="User question")
@@ -41,13 +54,13 @@ class RAGQueryRequest(BaseModel):
 async def rag_query(
     request: RAGQueryRequest,
     http_request: Request,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
 ):
     """
     RAG query endpoint.
     
     Retrieves relevant context from vector store and generates answer using LLM.
-    Logs query to PostgreSQL for analytics.
+    Logs query to PostgreSQL for analytics once the response has been sent.
     """
     request_id = getattr(http_request.state, "request_id", None)
     start_time = time.time()
@@ -61,12 +74,8 @@ async def rag_query(
         }
     )
     
-    query_record = None
+    query_id = uuid7()
     try:
-        # Override top_k if provided
-        if request.top_k:
-            rag_pipeline.top_k = request.top_k
-        
         # Execute RAG pipeline
         filter: Dict[str, Any] = {}
         if request.form_type:
@@ -97,22 +106,24 @@ async def rag_query(
             llm_provider=llm_provider,
             llm_api_key=llm_api_key,
             embedding_api_key=openai_key,
+            top_k=request.top_k,
         )
         
         latency_ms = (time.time() - start_time) * 1000
         
         # Extract token usage
-        tokens_used = None
-        if result.get("usage"):
-            if isinstance(result["usage"], dict):
-                tokens_used = result["usage"].get("total_tokens") or result["usage"].get("output_tokens")
+        usage = result.get("usage")
+        tokens_used = (usage.get("total_tokens") or usage.get("output_tokens")) if isinstance(usage, dict) else None
+        sources = result.get("sources")
+        sources_count = len(sources) if sources else 0
         
-        # Log query to PostgreSQL
-        query_record = QueryRepository.create_query(
-            db=db,
+        # Log query to PostgreSQL after the response is sent
+        background_tasks.add_task(
+            _log_query,
+            query_id=query_id,
             question=request.question,
             answer=result.get("answer"),
-            sources_count=len(result.get("sources", [])),
+            sources_count=sources_count,
             latency_ms=latency_ms,
             model=result.get("model"),
             provider=result.get("provider"),
@@ -123,8 +134,8 @@ async def rag_query(
             "RAG query successful",
             extra={
                 "request_id": request_id,
-                "query_id": str(query_record.id),
-                "sources_retrieved": len(result["sources"]),
+                "query_id": str(query_id),
+                "sources_retrieved": sources_count,
                 "latency_ms": latency_ms,
             }
         )
@@ -134,24 +145,26 @@ async def rag_query(
             data={
                 **result,
                 "latency_ms": latency_ms,
-                "query_id": str(query_record.id),  # Include query ID in response
+                "query_id": str(query_id),  # Include query ID in response
             },
             request_id=request_id,
         )
         
     except Exception as e:
-        # Log failed query
-        try:
-            QueryRepository.create_query(
-                db=db,
+        # Log failed query without delaying the error response (background
+        # tasks do not run when the endpoint raises)
+        asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                _log_query,
+                query_id=query_id,
                 question=request.question,
                 answer=None,
                 sources_count=0,
                 latency_ms=(time.time() - start_time) * 1000,
                 error_message=str(e),
-            )
-        except:
-            pass
+            ),
+        )
         
         logger.error(
             f"RAG query failed: {str(e)}",
@@ -1,16 +1,22 @@
 """
 SEC EDGAR endpoints.
 """
+import hashlib
+from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Request, Depends, HTTPException
+from fastapi import APIRouter, Request, Depends, HTTPException, Response
 from pydantic import BaseModel, Field
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.responses import APIResponse
+from app.core.ids import parse_uuid
+from app.core.responses import APIResponse, api_response, record_columns, record_dicts
 from app.core.logging_config import get_logger
-from app.database.database import get_db
+from app.database.database import get_async_db, get_db
 from app.database.models import SECFiling
-from app.database.repositories import SECIngestionJobRepository
+from app.database.repositories import SECIngestionJobRepository, split_total
+from app.database.types import date_text
 from app.services.sec.queue import SECFilingQueueProcessor
 from app.services.sec.edgar_client import EdgarClient
 from app.services.sec.ingestion import SECFilingIngestionService
@@ -20,11 +26,19 @@ from app.services.agent.research_agent import ResearchAgent
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/sec", tags=["sec"])
+# One instance of each per process: they share the EDGAR throttle state.
 edgar_client = EdgarClient()
-ingestor = SECFilingIngestionService()
+ingestor = SECFilingIngestionService(client=edgar_client)
 comparator = FilingComparator()
-agent = ResearchAgent()
-queue_processor = SECFilingQueueProcessor()
+agent = ResearchAgent(edgar_client=edgar_client, ingestor=ingestor, comparator=comparator)
+queue_processor = SECFilingQueueProcessor(ingestor=ingestor)
+
+# Response fields, serialized straight from ORM attributes or row columns by orjson.
+_JOB_FIELDS = (
+    "id", "cik", "accession_number", "form_type", "filed_date", "status",
+    "attempts", "error_message", "created_at", "updated_at",
+)
+_FILING_LIST_FIELDS = ("accession_number", "form_type", "filed_date", "document_id", "status")
 
 
 class SECFilingSearchRequest(BaseModel):
@@ -54,12 +68,6 @@ class SECFilingEnqueueRequest(BaseModel):
     filing_url: Optional[str] = Field(None)
 
 
-class SECJobListResponse(BaseModel):
-    jobs: List[dict]
-    limit: int
-    offset: int
-
-
 class SECResearchRequest(BaseModel):
     question: str = Field(..., min_length=1, max_length=5000)
     form_types: Optional[List[str]] = None
@@ -180,36 +188,29 @@ async def list_ingest_jobs(
     status: Optional[str] = None,
     limit: int = 20,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    after: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
     request_id = getattr(http_request.state, "request_id", None)
-    jobs = SECIngestionJobRepository.list_jobs(
+    jobs, total = await SECIngestionJobRepository.alist_jobs_page(
         db=db,
         status=status,
         limit=limit,
         offset=offset,
+        after=after,
     )
-    return APIResponse(
-        success=True,
-        data=SECJobListResponse(
-            jobs=[
-                {
-                    "id": str(job.id),
-                    "cik": job.cik,
-                    "accession_number": job.accession_number,
-                    "form_type": job.form_type,
-                    "filed_date": job.filed_date.isoformat() if job.filed_date else None,
-                    "status": job.status,
-                    "attempts": job.attempts,
-                    "error_message": job.error_message,
-                    "created_at": job.created_at.isoformat() if job.created_at else None,
-                    "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-                }
-                for job in jobs
-            ],
-            limit=limit,
-            offset=offset,
-        ).dict(),
+    return api_response(
+        {
+            "jobs": record_dicts(jobs, _JOB_FIELDS),
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "next_after": (
+                jobs[-1].created_at.isoformat()
+                if len(jobs) == limit and jobs[-1].created_at
+                else None
+            ),
+        },
         request_id=request_id,
     )
 
@@ -218,28 +219,18 @@ async def list_ingest_jobs(
 async def get_ingest_job(
     job_id: str,
     http_request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     request_id = getattr(http_request.state, "request_id", None)
-    from uuid import UUID
+    job_uuid = parse_uuid(job_id)
+    if job_uuid is None:
+        raise HTTPException(status_code=400, detail="Invalid job id")
 
-    job = SECIngestionJobRepository.get_job(db=db, job_id=UUID(job_id))
+    job = await SECIngestionJobRepository.aget_job(db=db, job_id=job_uuid)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return APIResponse(
-        success=True,
-        data={
-            "id": str(job.id),
-            "cik": job.cik,
-            "accession_number": job.accession_number,
-            "form_type": job.form_type,
-            "filed_date": job.filed_date.isoformat() if job.filed_date else None,
-            "status": job.status,
-            "attempts": job.attempts,
-            "error_message": job.error_message,
-            "created_at": job.created_at.isoformat() if job.created_at else None,
-            "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-        },
+    return api_response(
+        record_dicts((job,), _JOB_FIELDS)[0],
         request_id=request_id,
     )
 
@@ -248,11 +239,9 @@ async def get_ingest_job(
 async def research(
     request: SECResearchRequest,
     http_request: Request,
-    db: Session = Depends(get_db),
 ):
     request_id = getattr(http_request.state, "request_id", None)
     result = await agent.run(
-        db=db,
         question=request.question,
         form_types=request.form_types,
         date_from=request.date_from,
@@ -260,7 +249,7 @@ async def research(
         max_results=request.max_results,
         include_compare=request.include_compare,
     )
-    return APIResponse(success=True, data=result, request_id=request_id)
+    return api_response(result, request_id=request_id)
 
 
 @router.post("/compare", response_model=APIResponse)
@@ -275,7 +264,34 @@ async def compare_filings(
         focus_topic=request.focus_topic,
         top_k=request.top_k,
     )
-    return APIResponse(success=True, data=result, request_id=request_id)
+    return api_response(result, request_id=request_id)
+
+
+async def _filings_etag(db: AsyncSession, *params) -> str:
+    """Weak ETag for a filings page: one aggregate row over sec_filings plus the page params.
+
+    Inserts and deletes move the row count; every update (status transitions,
+    document_id) bumps ``updated_at``, so an unchanged ETag means an unchanged page.
+    """
+    fingerprint = await db.execute(
+        select(
+            func.count(),
+            func.max(SECFiling.updated_at),
+        )
+    )
+    digest = hashlib.blake2b(repr((tuple(fingerprint.one()), params)).encode(), digest_size=16).hexdigest()
+    # Weak: the envelope's timestamp differs between otherwise identical bodies.
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    opaque = etag[2:]
+    return any(
+        tag == "*" or tag.removeprefix("W/") == opaque
+        for tag in map(str.strip, if_none_match.split(","))
+    )
 
 
 @router.get("/filings", response_model=APIResponse)
@@ -283,31 +299,39 @@ async def list_indexed_filings(
     http_request: Request,
     limit: int = 20,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    columnar: bool = False,
+    db: AsyncSession = Depends(get_async_db),
 ):
+    """List indexed filings; ``columnar=true`` returns ``filings`` as ``{field: [values...]}``.
+
+    Supports conditional GET: a matching ``If-None-Match`` gets an empty 304.
+    """
     request_id = getattr(http_request.state, "request_id", None)
-    filings = (
-        db.query(SECFiling)
-        .order_by(SECFiling.filed_date.desc())
+    etag = await _filings_etag(db, limit, offset, columnar)
+    if _etag_matches(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    rows = await db.execute(
+        select(
+            SECFiling.accession_number,
+            SECFiling.form_type,
+            date_text(SECFiling.filed_date).label("filed_date"),
+            SECFiling.document_id,
+            SECFiling.status,
+            func.count().over(),
+        )
+        .order_by(SECFiling.filed_date.desc(), SECFiling.id.desc())
         .limit(limit)
         .offset(offset)
-        .all()
     )
-    return APIResponse(
-        success=True,
-        data={
-            "filings": [
-                {
-                    "accession_number": f.accession_number,
-                    "form_type": f.form_type,
-                    "filed_date": f.filed_date.isoformat() if f.filed_date else None,
-                    "document_id": str(f.document_id) if f.document_id else None,
-                    "status": f.status,
-                }
-                for f in filings
-            ],
+    filings, total = split_total(rows.all(), offset, columns=True)
+    response = api_response(
+        {
+            "filings": (record_columns if columnar else record_dicts)(filings, _FILING_LIST_FIELDS),
+            "total": total,
             "limit": limit,
             "offset": offset,
         },
         request_id=request_id,
     )
+    response.headers["ETag"] = etag
+    return response
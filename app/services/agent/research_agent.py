@@ -1,14 +1,24 @@
 """
 Agentic multi-step research for SEC filings.
 """
+import asyncio
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
-from sqlalchemy.orm import Session
-
+from app.core.config import (
+    RESEARCH_CACHE_ENABLED,
+    RESEARCH_CACHE_MAX_ENTRIES,
+    RESEARCH_CACHE_THRESHOLD,
+    SEC_RESEARCH_INGEST_CONCURRENCY,
+    SEMANTIC_CACHE_TTL_SECONDS,
+)
 from app.core.logging_config import get_logger
+from app.database.database import SessionLocal
+from app.database.models import SECFiling
+from app.services.embeddings.embedding_router import get_embedding_model
 from app.services.rag.pipeline import RAGPipeline
-from app.services.sec.edgar_client import EdgarClient
+from app.services.semantic_cache import SemanticCache
+from app.services.sec.edgar_client import EdgarClient, FilingSearchResult
 from app.services.sec.ingestion import SECFilingIngestionService
 from app.services.sec.comparator import FilingComparator
 from app.services.sec.cross_reference import extract_accession_numbers
@@ -17,17 +27,66 @@ logger = get_logger(__name__)
 
 
 class ResearchAgent:
-    """Multi-step agent to search, ingest, and answer SEC questions."""
+    """Multi-step agent to search, ingest, and answer SEC questions.
+
+    With ``RESEARCH_CACHE_ENABLED``, results are cached by question embedding:
+    a paraphrase of an earlier question (same filters) returns the earlier
+    result without searching, ingesting or querying again.
+    """
 
-    def __init__(self):
-        self.edgar_client = EdgarClient()
-        self.ingestor = SECFilingIngestionService()
+    def __init__(
+        self,
+        edgar_client: Optional[EdgarClient] = None,
+        ingestor: Optional[SECFilingIngestionService] = None,
+        comparator: Optional[FilingComparator] = None,
+    ):
+        # Callers that already hold these (the SEC router) pass them in, so
+        # there is one EDGAR throttle and one ingestion processor per process.
+        self.edgar_client = edgar_client or EdgarClient()
+        self.ingestor = ingestor or SECFilingIngestionService(client=self.edgar_client)
         self.rag = RAGPipeline(top_k=6, context_window=5000)
-        self.comparator = FilingComparator()
+        self.comparator = comparator or FilingComparator()
+        self.cache = SemanticCache(
+            threshold=RESEARCH_CACHE_THRESHOLD,
+            ttl_seconds=SEMANTIC_CACHE_TTL_SECONDS,
+            max_entries=RESEARCH_CACHE_MAX_ENTRIES,
+        )
+
+    async def _embed_question(self, question: str):
+        """Embed a question for the cache; ``None`` skips caching for this run."""
+        try:
+            embedding_model = get_embedding_model()
+            if hasattr(embedding_model, "embed_async"):
+                embedding = await embedding_model.embed_async(question)
+            else:
+                embedding = embedding_model.embed(question)
+            return SemanticCache.normalize(embedding)
+        except Exception as e:
+            logger.warning(f"Research cache embedding failed: {e}")
+            return None
+
+    async def _ingest_one(self, result: FilingSearchResult, semaphore: asyncio.Semaphore) -> SECFiling:
+        # One session per filing: a shared Session is not safe across tasks.
+        async with semaphore:
+            db = SessionLocal()
+            try:
+                return await self.ingestor.ingest_filing(
+                    db=db,
+                    cik=result.cik,
+                    accession_number=result.accession_number,
+                    form_type=result.form_type,
+                    filed_date=result.filed_date,
+                    company_name=result.company_name,
+                    filing_url=result.filing_url,
+                )
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
 
     async def run(
         self,
-        db: Session,
         question: str,
         form_types: Optional[List[str]] = None,
         date_from: Optional[str] = None,
@@ -40,6 +99,16 @@ class ResearchAgent:
             extra={"question_length": len(question), "max_results": max_results},
         )
 
+        question_vector = None
+        cache_scope = f"{form_types}\x1f{date_from}\x1f{date_to}\x1f{max_results}\x1f{include_compare}"
+        if RESEARCH_CACHE_ENABLED:
+            question_vector = await self._embed_question(question)
+            if question_vector is not None:
+                cached = self.cache.lookup(cache_scope, question_vector)
+                if cached is not None:
+                    logger.info("Research cache hit")
+                    return cached
+
         search_results = await self.edgar_client.search_filings(
             query=question,
             start=0,
@@ -49,20 +118,22 @@ class ResearchAgent:
             date_to=date_to,
         )
 
+        # Filings download concurrently; results keep search order.
+        unique = {r.accession_number: r for r in search_results if r.accession_number}
+        semaphore = asyncio.Semaphore(max(1, SEC_RESEARCH_INGEST_CONCURRENCY))
+        outcomes = await asyncio.gather(
+            *(self._ingest_one(result, semaphore) for result in unique.values()),
+            return_exceptions=True,
+        )
         ingested = []
-        for result in search_results:
-            if not result.accession_number:
+        for result, outcome in zip(unique.values(), outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(
+                    f"Research agent failed to ingest filing: {outcome}",
+                    extra={"accession_number": result.accession_number},
+                )
                 continue
-            filing = await self.ingestor.ingest_filing(
-                db=db,
-                cik=result.cik,
-                accession_number=result.accession_number,
-                form_type=result.form_type,
-                filed_date=result.filed_date,
-                company_name=result.company_name,
-                filing_url=result.filing_url,
-            )
-            ingested.append(filing)
+            ingested.append(outcome)
 
         filter_payload: Dict[str, Any] = {"source_type": "sec_filing"}
         if form_types and len(form_types) == 1:
@@ -77,9 +148,10 @@ class ResearchAgent:
             filter=filter_payload,
         )
 
+        sources = rag_result.get("sources") or []
         references = []
-        for source in rag_result.get("sources", []):
-            references.extend(extract_accession_numbers(source.get("content", "")))
+        for source in sources:
+            references.extend(extract_accession_numbers(source.get("content") or ""))
 
         compare_result = None
         if include_compare and len(ingested) >= 2:
@@ -89,9 +161,9 @@ class ResearchAgent:
                 focus_topic=question,
             )
 
-        return {
+        result = {
             "answer": rag_result.get("answer"),
-            "sources": rag_result.get("sources"),
+            "sources": sources,
             "ingested_filings": [
                 {
                     "accession_number": f.accession_number,
@@ -104,3 +176,6 @@ class ResearchAgent:
             "references": references,
             "comparison": compare_result,
         }
+        if question_vector is not None:
+            self.cache.add(cache_scope, question_vector, result)
+        return result
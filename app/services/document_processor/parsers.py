@@ -1,7 +1,8 @@
 """
 Document parsers for different file types.
 """
-from typing import Optional
+from concurrent.futures import Executor
+from typing import BinaryIO, List, Optional, Union
 from pathlib import Path
 import mimetypes
 
@@ -35,64 +36,124 @@ class MarkdownParser:
             return content.decode(encoding, errors="replace")
 
 
+def _pdf_reader(pdf_file: BinaryIO):
+    """Open a PDF with ``pypdf`` (faster extraction) when installed, else PyPDF2."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        try:
+            from PyPDF2 import PdfReader
+        except ImportError:
+            raise ImportError(
+                "PyPDF2 is required for PDF parsing. Install with: pip install PyPDF2"
+            )
+    return PdfReader(pdf_file)
+
+
 class PDFParser:
     """Parser for PDF files."""
     
     @staticmethod
-    def parse(content: bytes) -> str:
-        """Parse PDF content."""
+    def parse(content: Union[bytes, BinaryIO]) -> str:
+        """Parse PDF content (bytes, or a seekable binary file read in place)."""
         try:
-            import PyPDF2
             import io
             
-            pdf_file = io.BytesIO(content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            pdf_file = io.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+            pdf_reader = _pdf_reader(pdf_file)
             
-            text_parts = []
-            for page in pdf_reader.pages:
-                text_parts.append(page.extract_text())
+            # Pages are extracted one at a time straight into the join.
+            return "\n\n".join(page.extract_text() for page in pdf_reader.pages)
+        except ImportError:
+            raise
+        except Exception as e:
+            logger.error(f"Error parsing PDF: {e}", exc_info=True)
+            raise ValueError(f"Failed to parse PDF: {str(e)}")
+    
+    @staticmethod
+    def parse_parallel(content: bytes, executor: Executor, workers: int) -> str:
+        """
+        Parse PDF content with page ranges extracted concurrently on ``executor``.
+        
+        Pages are split into ``workers`` contiguous ranges; with a process
+        pool this spreads the pure-Python text extraction across cores. The
+        output matches ``parse``.
+        """
+        try:
+            import io
             
-            return "\n\n".join(text_parts)
+            page_count = len(_pdf_reader(io.BytesIO(content)).pages)
         except ImportError:
-            raise ImportError(
-                "PyPDF2 is required for PDF parsing. Install with: pip install PyPDF2"
-            )
+            raise
+        except Exception as e:
+            logger.error(f"Error parsing PDF: {e}", exc_info=True)
+            raise ValueError(f"Failed to parse PDF: {str(e)}")
+        
+        if workers <= 1 or page_count < 2:
+            return PDFParser.parse(content)
+        
+        step = -(-page_count // workers)
+        futures = [
+            executor.submit(_extract_page_range, content, start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        text_parts: List[str] = []
+        try:
+            for future in futures:
+                text_parts.extend(future.result())
         except Exception as e:
             logger.error(f"Error parsing PDF: {e}", exc_info=True)
             raise ValueError(f"Failed to parse PDF: {str(e)}")
+        return "\n\n".join(text_parts)
 
 
-def parse_document(file_path: Optional[str] = None, content: Optional[bytes] = None) -> str:
+def _extract_page_range(content: bytes, start: int, stop: int) -> List[str]:
+    """Extract text for pages ``[start, stop)`` (module-level so process pools can pickle it)."""
+    import io
+    
+    pages = _pdf_reader(io.BytesIO(content)).pages
+    return [pages[i].extract_text() for i in range(start, stop)]
+
+
+def parse_document(
+    file_path: Optional[str] = None,
+    content: Optional[bytes] = None,
+    stream: Optional[BinaryIO] = None,
+) -> str:
     """
     Parse a document based on file type.
     
     Args:
         file_path: Path to file
         content: Raw file content (bytes)
+        stream: Seekable binary file positioned at the start of the content;
+            PDFs are parsed from it without loading the whole file
         
     Returns:
         Extracted text content
     """
     if file_path:
         path = Path(file_path)
-        if content is None:
-            content = path.read_bytes()
-        
         mime_type, _ = mimetypes.guess_type(str(path))
         extension = path.suffix.lower()
         
         # Determine parser based on extension or MIME type
         if extension == ".pdf" or mime_type == "application/pdf":
-            return PDFParser.parse(content)
-        elif extension in [".md", ".markdown"] or mime_type == "text/markdown":
+            if content is None and stream is not None:
+                return PDFParser.parse(stream)
+            return PDFParser.parse(content if content is not None else path.read_bytes())
+        
+        if content is None:
+            content = stream.read() if stream is not None else path.read_bytes()
+        if extension in [".md", ".markdown"] or mime_type == "text/markdown":
             return MarkdownParser.parse(content)
         else:
             # Default to text parser
             return TextParser.parse(content)
     
-    elif content:
+    elif content or stream is not None:
         # Try to parse as text if no file path
-        return TextParser.parse(content)
+        return TextParser.parse(content if content else stream.read())
     
     else:
         raise ValueError("Either file_path or content must be provided")
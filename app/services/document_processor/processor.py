@@ -1,16 +1,68 @@
 """
 Document processing: parsing, chunking, and metadata extraction.
 """
+import bisect
+import functools
+import itertools
 import re
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import mimetypes
+import numpy as np
 from pydantic import BaseModel
 
+from app.core.config import SENTENCE_SPLITTER
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# ASCII bytes that str.split() and str.splitlines() treat as separators.
+_WORD_SEP = np.zeros(256, dtype=bool)
+_WORD_SEP[[0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E, 0x1F, 0x20]] = True
+_LINE_SEP = np.zeros(256, dtype=bool)
+_LINE_SEP[[0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E]] = True
+
+
+def _count_words_lines(content: str) -> Tuple[int, int]:
+    """Return ``(len(content.split()), len(content.splitlines()))`` without building either list."""
+    if not content:
+        return 0, 0
+    if not content.isascii():
+        # Unicode whitespace and line breaks span several UTF-8 bytes; take the exact path.
+        return len(content.split()), len(content.splitlines())
+    data = np.frombuffer(content.encode("ascii"), dtype=np.uint8)
+    space = _WORD_SEP[data]
+    words = int(not space[0]) + int(np.count_nonzero(space[:-1] & ~space[1:]))
+    breaks = _LINE_SEP[data]
+    crlf = np.count_nonzero((data[:-1] == 0x0D) & (data[1:] == 0x0A))
+    lines = int(np.count_nonzero(breaks)) - int(crlf) + int(not breaks[-1])
+    return words, lines
+
+
+def _split_sentences_regex(text: str) -> List[str]:
+    # Splits consume all whitespace between sentences, so after stripping the
+    # ends once every piece is already stripped and non-empty.
+    text = text.strip()
+    return _SENTENCE_END.split(text) if text else []
+
+
+@functools.lru_cache(maxsize=1)
+def _sentence_tokenizer() -> Callable[[str], List[str]]:
+    """Return the configured sentence splitter (stripped, non-empty sentences), built once per process."""
+    if SENTENCE_SPLITTER == "nupunkt":
+        try:
+            import nupunkt_rs
+        except ImportError:
+            raise ImportError(
+                "nupunkt-rs is required for SENTENCE_SPLITTER=nupunkt. Install with: pip install nupunkt-rs"
+            )
+        # Punkt model trained on legal/financial text; knows "Inc.", "No.", "U.S." etc.
+        tokenize = nupunkt_rs.create_default_tokenizer().tokenize
+        return lambda text: [s for s in map(str.strip, tokenize(text)) if s]
+    return _split_sentences_regex
+
 
 class DocumentChunk(BaseModel):
     """A chunk of a document."""
@@ -39,6 +91,12 @@ class DocumentProcessor:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.chunk_strategy = chunk_strategy
+        # Processors are shared per config and never reconfigured, so the
+        # strategy dispatch is resolved once here instead of on every call.
+        self._chunk = {
+            "sentence": self._chunk_by_sentence,
+            "token": self._chunk_by_tokens,
+        }.get(chunk_strategy, self._chunk_fixed)
     
     def process_text(
         self,
@@ -56,63 +114,52 @@ class DocumentProcessor:
             List of DocumentChunk objects
         """
         metadata = metadata or {}
+        chunks = self._chunk(text)
         
-        if self.chunk_strategy == "sentence":
-            chunks = self._chunk_by_sentence(text)
-        elif self.chunk_strategy == "token":
-            chunks = self._chunk_by_tokens(text)
-        else:  # fixed
-            chunks = self._chunk_fixed(text)
-        
-        result = []
-        for i, chunk_text in enumerate(chunks):
-            result.append(DocumentChunk(
+        # Each chunk needs its own metadata dict (it is stored per chunk and SEC
+        # ingest renumbers chunk_index in place), but only one: model_construct
+        # skips validation, which would copy every dict a second time.
+        result = [
+            DocumentChunk.model_construct(
                 content=chunk_text,
                 metadata={**metadata, "chunk_index": i},
                 chunk_index=i,
-            ))
+            )
+            for i, chunk_text in enumerate(chunks)
+        ]
         
         logger.info(f"Processed text into {len(result)} chunks")
         return result
     
     def _chunk_by_sentence(self, text: str) -> List[str]:
         """Chunk text by sentences."""
-        # Split by sentence endings
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = _sentence_tokenizer()(text)
+        lengths = list(map(len, sentences))
+        # offsets[j] = total length of sentences[:j]
+        offsets = list(itertools.accumulate(lengths, initial=0))
+        
+        chunk_size, chunk_overlap = self.chunk_size, self.chunk_overlap
         
         chunks = []
-        current_chunk = []
+        start = 0  # first sentence of the current chunk
         current_size = 0
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-            
-            sentence_size = len(sentence)
-            
-            if current_size + sentence_size > self.chunk_size and current_chunk:
+        for i, sentence_size in enumerate(lengths):
+            if current_size + sentence_size > chunk_size and i > start:
                 # Save current chunk
-                chunks.append(" ".join(current_chunk))
+                chunks.append(" ".join(sentences[start:i]))
                 
-                # Start new chunk with overlap
-                overlap_sentences = []
-                overlap_size = 0
-                for s in reversed(current_chunk):
-                    if overlap_size + len(s) <= self.chunk_overlap:
-                        overlap_sentences.insert(0, s)
-                        overlap_size += len(s)
-                    else:
-                        break
+                # Start new chunk with the longest run of trailing sentences
+                # that fits in the overlap: offsets is sorted, so bisect for it.
+                overlap_start = bisect.bisect_left(offsets, offsets[i] - chunk_overlap, start, i)
                 
-                current_chunk = overlap_sentences
-                current_size = overlap_size
+                start = overlap_start
+                current_size = offsets[i] - offsets[overlap_start]
             
-            current_chunk.append(sentence)
             current_size += sentence_size + 1  # +1 for space
         
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
+        if start < len(sentences):
+            chunks.append(" ".join(sentences[start:]))
         
         return chunks
     
@@ -182,7 +229,6 @@ class DocumentProcessor:
         
         if content:
             metadata["content_length"] = len(content)
-            metadata["word_count"] = len(content.split())
-            metadata["line_count"] = len(content.splitlines())
+            metadata["word_count"], metadata["line_count"] = _count_words_lines(content)
         
         return metadata
@@ -1,6 +1,7 @@
 """
 Base embedding interface for provider abstraction.
 """
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Union
 import numpy as np
@@ -9,6 +10,8 @@ import numpy as np
 class BaseEmbeddingModel(ABC):
     """Abstract base class for all embedding models."""
     
+    provider_name: str = "unknown"
+    
     def __init__(self, model_name: str):
         self.model_name = model_name
         self.dimension = None  # Will be set by implementation
@@ -26,6 +29,22 @@ class BaseEmbeddingModel(ABC):
         """
         pass
     
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed many texts into one contiguous (n, dim) float32 array.
+        
+        Ingest keeps this matrix end to end instead of a list of Python float
+        lists; providers that already produce arrays override it.
+        """
+        return np.asarray(self.embed(texts), dtype=np.float32).reshape(len(texts), -1)
+    
+    async def embed_batch_async(self, texts: List[str]) -> np.ndarray:
+        """Async version of ``embed_batch``."""
+        embed_async = getattr(self, "embed_async", None)
+        if embed_async is None:
+            return await asyncio.to_thread(self.embed_batch, texts)
+        return np.asarray(await embed_async(texts), dtype=np.float32).reshape(len(texts), -1)
+    
     @abstractmethod
     def get_dimension(self) -> int:
         """Return the dimension of embeddings produced by this model."""
@@ -44,3 +63,26 @@ class BaseEmbeddingModel(ABC):
             return 0.0
         
         return float(dot_product / (norm1 * norm2))
+    
+    @staticmethod
+    def cosine_similarity_batch(query, matrix, normalized: bool = True) -> np.ndarray:
+        """
+        Cosine similarity of ``query`` against every row of ``matrix`` in one matmul.
+        
+        Args:
+            query: Vector of shape (dim,)
+            matrix: Vectors of shape (n, dim), ideally one stacked float32 array
+            normalized: Inputs are already unit length (e.g. stored chunk
+                vectors), so similarity is a plain dot product
+            
+        Returns:
+            float32 array of shape (n,)
+        """
+        query = np.asarray(query, dtype=np.float32)
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if not len(matrix):
+            return np.zeros(0, dtype=np.float32)
+        if not normalized:
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+            matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        return matrix @ query
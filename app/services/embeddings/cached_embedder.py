@@ -0,0 +1,112 @@
+"""
+In-process LRU cache in front of an embedding model.
+
+Repeated texts (the same question asked twice, boilerplate shared across SEC
+filings) skip the provider call or forward pass. Complements the database
+cache in ``embedding_cache``: this one also covers query embeddings and never
+leaves the process. Cached vectors are held as float16 to halve the
+footprint and widened back to float32 on a hit; freshly computed vectors are
+returned unrounded.
+"""
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from app.services.embeddings.base import BaseEmbeddingModel
+
+
+def _key(text: str) -> bytes:
+    # Content addressing only, so a short non-cryptographic-strength digest is enough.
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class CachedEmbedder(BaseEmbeddingModel):
+    """Wrap ``inner`` with an LRU of at most ``capacity`` float16 vectors.
+
+    Keys are BLAKE2b digests of the text; one cache belongs to one wrapped
+    model, so provider and model are implied. A batch sends only its distinct
+    misses to ``inner``, in a single call. ``cache_hits`` / ``cache_misses``
+    count texts served from the cache and texts sent to ``inner``.
+    """
+
+    def __init__(self, inner: BaseEmbeddingModel, capacity: int = 100_000) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        super().__init__(inner.model_name)
+        self.inner = inner
+        self.provider_name = inner.provider_name
+        self.dimension = inner.dimension
+        self.capacity = capacity
+        self._lock = Lock()
+        self._vectors: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _partition(self, texts: List[str]) -> Tuple[List[bytes], Dict[bytes, np.ndarray], Dict[bytes, str]]:
+        """Return (keys, cached vectors by key, distinct missing texts by key)."""
+        keys = [_key(text) for text in texts]
+        hits: Dict[bytes, np.ndarray] = {}
+        misses: Dict[bytes, str] = {}
+        with self._lock:
+            for key, text in zip(keys, texts):
+                vector = self._vectors.get(key)
+                if vector is not None:
+                    self._vectors.move_to_end(key)
+                    hits[key] = vector
+                else:
+                    misses.setdefault(key, text)
+            self.cache_misses += len(misses)
+            self.cache_hits += len(keys) - len(misses)
+        return keys, hits, misses
+
+    def _merge(
+        self,
+        keys: List[bytes],
+        hits: Dict[bytes, np.ndarray],
+        misses: Dict[bytes, str],
+        computed: np.ndarray,
+    ) -> np.ndarray:
+        if not keys:
+            return np.zeros((0, self.get_dimension()), dtype=np.float32)
+        fresh = np.asarray(computed, dtype=np.float32)
+        with self._lock:
+            for key, vector in zip(misses, fresh.astype(np.float16)):
+                self._vectors[key] = vector
+            while len(self._vectors) > self.capacity:
+                self._vectors.popitem(last=False)
+        # Misses go out at full precision; only cache hits pass through float16.
+        hits.update(zip(misses, fresh))
+        return np.stack([hits[key] for key in keys]).astype(np.float32, copy=False)
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        keys, hits, misses = self._partition(texts)
+        computed = self.inner.embed_batch(list(misses.values())) if misses else ()
+        return self._merge(keys, hits, misses, computed)
+
+    async def embed_batch_async(self, texts: List[str]) -> np.ndarray:
+        keys, hits, misses = self._partition(texts)
+        computed = await self.inner.embed_batch_async(list(misses.values())) if misses else ()
+        return self._merge(keys, hits, misses, computed)
+
+    def embed(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
+        if isinstance(text, str):
+            return self.embed_batch([text])[0].tolist()
+        return self.embed_batch(text).tolist()
+
+    async def embed_async(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
+        if isinstance(text, str):
+            return (await self.embed_batch_async([text]))[0].tolist()
+        return (await self.embed_batch_async(text)).tolist()
+
+    def get_dimension(self) -> int:
+        return self.inner.get_dimension()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+
+    def __len__(self) -> int:
+        return len(self._vectors)
@@ -0,0 +1,177 @@
+"""
+Database-backed embedding cache for ingestion.
+
+Re-ingesting identical text (e.g. the same SEC filing) reuses stored vectors
+instead of paying the embedding provider again. Results are one (n, dim)
+float32 matrix, not lists of Python floats.
+"""
+import asyncio
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import EMBED_BATCH_SIZE, EMBED_CONCURRENCY
+from app.database.database import SessionLocal
+from app.database.repositories import EmbeddingCacheRepository
+from app.services.embeddings.base import BaseEmbeddingModel
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _content_hashes(texts: List[str]) -> List[str]:
+    return [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+
+
+def _lookup(
+    db: Session,
+    texts: List[str],
+    embedding_model: BaseEmbeddingModel,
+) -> Tuple[List[str], Dict[str, List[float]], List[str]]:
+    """Return (hashes, cached vectors by hash, distinct hashes to compute)."""
+    hashes = _content_hashes(texts)
+    try:
+        cached = EmbeddingCacheRepository.get_many(
+            db, hashes, embedding_model.provider_name, embedding_model.model_name
+        )
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Embedding cache lookup failed: {e}")
+        cached = {}
+    missing = list(dict.fromkeys(h for h in hashes if h not in cached))
+    return hashes, cached, missing
+
+
+def _store(
+    db: Session,
+    embedding_model: BaseEmbeddingModel,
+    computed: Dict[str, List[float]],
+) -> None:
+    try:
+        EmbeddingCacheRepository.put_many(
+            db, computed, embedding_model.provider_name, embedding_model.model_name
+        )
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Embedding cache write failed: {e}")
+
+
+def _in_own_session(fn, *args):
+    # Worker-thread entry point: a private session, so the cache commit never
+    # flushes anything pending on the caller's session.
+    db = SessionLocal()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+def _texts_for(texts: List[str], hashes: List[str], missing: List[str]) -> List[str]:
+    first_text = {}
+    for text, content_hash in zip(texts, hashes):
+        first_text.setdefault(content_hash, text)
+    return [first_text[content_hash] for content_hash in missing]
+
+
+def _batches(texts: List[str], batch_size: int) -> List[List[str]]:
+    size = max(1, batch_size)
+    return [texts[i:i + size] for i in range(0, len(texts), size)]
+
+
+def embed_in_batches(
+    embedding_model: BaseEmbeddingModel,
+    texts: List[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+) -> np.ndarray:
+    """Embed ``texts`` in requests of at most ``batch_size`` texts; rows keep input order."""
+    return _stack([embedding_model.embed_batch(batch) for batch in _batches(texts, batch_size)])
+
+
+async def aembed_in_batches(
+    embedding_model: BaseEmbeddingModel,
+    texts: List[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+    concurrency: int = EMBED_CONCURRENCY,
+) -> np.ndarray:
+    """Like ``embed_in_batches``, with up to ``concurrency`` batches in flight."""
+    batches = _batches(texts, batch_size)
+    if len(batches) == 1:
+        return await embedding_model.embed_batch_async(batches[0])
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(batch: List[str]) -> np.ndarray:
+        async with semaphore:
+            return await embedding_model.embed_batch_async(batch)
+
+    return _stack(await asyncio.gather(*(run(batch) for batch in batches)))
+
+
+def _stack(blocks: List[np.ndarray]) -> np.ndarray:
+    return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
+
+def _assemble(
+    hashes: List[str],
+    cached: Dict[str, List[float]],
+    missing: List[str],
+    computed: Optional[np.ndarray],
+) -> np.ndarray:
+    """Gather cached and freshly computed vectors into one matrix in ``hashes`` order."""
+    blocks = []
+    row_of: Dict[str, int] = {}
+    if missing:
+        blocks.append(computed)
+        row_of.update(zip(missing, range(len(missing))))
+    if cached:
+        blocks.append(np.asarray(list(cached.values()), dtype=np.float32))
+        row_of.update(zip(cached, range(len(missing), len(missing) + len(cached))))
+    order = [row_of[content_hash] for content_hash in hashes]
+    rows = _stack(blocks)
+    if order == list(range(len(rows))):
+        return rows
+    return rows[order]
+
+
+def get_or_compute_embeddings(
+    db: Session,
+    texts: List[str],
+    embedding_model: BaseEmbeddingModel,
+) -> np.ndarray:
+    """Embed ``texts`` into an (n, dim) matrix, sending only uncached (and de-duplicated) texts to the model."""
+    if not texts:
+        return np.zeros((0, embedding_model.get_dimension()), dtype=np.float32)
+    hashes, cached, missing = _lookup(db, texts, embedding_model)
+    computed = None
+    if missing:
+        computed = embed_in_batches(embedding_model, _texts_for(texts, hashes, missing))
+        _store(db, embedding_model, dict(zip(missing, computed)))
+    logger.info(
+        "Embedding cache",
+        extra={"texts": len(texts), "computed": len(missing)},
+    )
+    return _assemble(hashes, cached, missing, computed)
+
+
+async def get_or_compute_embeddings_async(
+    texts: List[str],
+    embedding_model: BaseEmbeddingModel,
+) -> np.ndarray:
+    """Async version of ``get_or_compute_embeddings``.
+
+    The cache lookup and write run in a worker thread on their own session,
+    keeping the event loop free.
+    """
+    if not texts:
+        return np.zeros((0, embedding_model.get_dimension()), dtype=np.float32)
+    hashes, cached, missing = await asyncio.to_thread(_in_own_session, _lookup, texts, embedding_model)
+    computed = None
+    if missing:
+        computed = await aembed_in_batches(embedding_model, _texts_for(texts, hashes, missing))
+        await asyncio.to_thread(_in_own_session, _store, embedding_model, dict(zip(missing, computed)))
+    logger.info(
+        "Embedding cache",
+        extra={"texts": len(texts), "computed": len(missing)},
+    )
+    return _assemble(hashes, cached, missing, computed)
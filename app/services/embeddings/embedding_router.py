@@ -2,10 +2,13 @@
 Embedding model factory/router.
 """
 from typing import Optional
-from app.core.config import OPENAI_API_KEY, EMBEDDING_PROVIDER, LOCAL_EMBEDDING_MODEL
+from app.core.config import (
+    OPENAI_API_KEY, EMBEDDING_PROVIDER, LOCAL_EMBEDDING_MODEL, EMBEDDING_MEMORY_CACHE_SIZE,
+)
 from app.services.embeddings.openai_embeddings import OpenAIEmbeddings
 from app.services.embeddings.local_embeddings import LocalEmbeddings
 from app.services.embeddings.base import BaseEmbeddingModel
+from app.services.embeddings.cached_embedder import CachedEmbedder
 from app.core.exceptions import ConfigurationError
 from app.core.logging_config import get_logger
 
@@ -15,6 +18,17 @@ logger = get_logger(__name__)
 _embedding_model: Optional[BaseEmbeddingModel] = None
 
 
+def _with_memory_cache(model: BaseEmbeddingModel) -> BaseEmbeddingModel:
+    """Front the singleton with the in-process vector LRU unless it is disabled."""
+    if EMBEDDING_MEMORY_CACHE_SIZE <= 0:
+        return model
+    return CachedEmbedder(model, capacity=EMBEDDING_MEMORY_CACHE_SIZE)
+
+
+def _unwrap(model: Optional[BaseEmbeddingModel]) -> Optional[BaseEmbeddingModel]:
+    return model.inner if isinstance(model, CachedEmbedder) else model
+
+
 def get_embedding_model(
     provider: Optional[str] = None,
     model_name: Optional[str] = None,
@@ -49,11 +63,11 @@ def get_embedding_model(
         
         # Return cached instance only when using env key
         if not api_key:
-            if _embedding_model and isinstance(_embedding_model, OpenAIEmbeddings):
+            if _embedding_model and isinstance(_unwrap(_embedding_model), OpenAIEmbeddings):
                 if _embedding_model.model_name == model:
                     return _embedding_model
 
-            _embedding_model = OpenAIEmbeddings(api_key=resolved_key, model_name=model)
+            _embedding_model = _with_memory_cache(OpenAIEmbeddings(api_key=resolved_key, model_name=model))
             logger.info(
                 "Initialized OpenAI embeddings",
                 extra={"provider": "openai", "model": model, "dimension": _embedding_model.get_dimension()}
@@ -66,11 +80,11 @@ def get_embedding_model(
     elif provider == "local":
         model = model_name or LOCAL_EMBEDDING_MODEL
         
-        if _embedding_model and isinstance(_embedding_model, LocalEmbeddings):
+        if _embedding_model and isinstance(_unwrap(_embedding_model), LocalEmbeddings):
             if _embedding_model.model_name == model:
                 return _embedding_model
         
-        _embedding_model = LocalEmbeddings(model_name=model)
+        _embedding_model = _with_memory_cache(LocalEmbeddings(model_name=model))
         logger.info(
             "Initialized local embeddings",
             extra={"provider": "local", "model": model, "dimension": _embedding_model.get_dimension()}
@@ -3,29 +3,78 @@ Local embeddings implementation using sentence-transformers.
 """
 from typing import List, Union
 import asyncio
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
+from sentence_transformers.util import batch_to_device
 
+from app.core.config import EMBED_BATCH_SIZE, LOCAL_EMBEDDING_DEVICE, LOCAL_EMBEDDING_FP16
 from app.services.embeddings.base import BaseEmbeddingModel
 
 
+def _resolve_device(device: str) -> str:
+    if device != "auto":
+        return device
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
 class LocalEmbeddings(BaseEmbeddingModel):
     """Sentence-transformers embeddings model."""
 
+    provider_name = "local"
+
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         super().__init__(model_name)
-        self.model = SentenceTransformer(model_name)
+        self.device = _resolve_device(LOCAL_EMBEDDING_DEVICE)
+        self.model = SentenceTransformer(model_name, device=self.device)
+        if self.device != "cpu" and LOCAL_EMBEDDING_FP16:
+            # Half precision on accelerators; outputs are widened back to float32.
+            self.model.half()
         self.dimension = int(self.model.get_sentence_embedding_dimension())
 
     def embed(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
-        is_single = isinstance(text, str)
-        texts = [text] if is_single else text
-        embeddings = self.model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
-        if is_single:
-            return embeddings[0].tolist()
-        return [embedding.tolist() for embedding in embeddings]
+        if isinstance(text, str):
+            return self._embed_one(text).tolist()
+        # One tolist() on the matrix instead of one per row.
+        return self.embed_batch(text).tolist()
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        """
+        Embed a single text with one forward pass through the model's modules.
+        
+        Same vector as ``embed_batch([text])[0]`` (the model's own pooling, then
+        unit length) without ``encode``'s sorting, batching and collation.
+        """
+        features = batch_to_device(self.model.tokenize([text]), self.model.device)
+        with torch.inference_mode():
+            vector = self.model(features)["sentence_embedding"][0]
+            vector = torch.nn.functional.normalize(vector, dim=0)
+        return vector.float().cpu().numpy()
+
+    def embed_batch(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+        """
+        Embed many texts in forward passes of ``batch_size``; returns an (n, dim) float32 array.
+        
+        Vectors are unit length (like OpenAI's), so cosine similarity is a dot product.
+        """
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        return np.asarray(embeddings, dtype=np.float32)
 
     async def embed_async(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
         return await asyncio.to_thread(self.embed, text)
 
+    async def embed_batch_async(self, texts: List[str]) -> np.ndarray:
+        return await asyncio.to_thread(self.embed_batch, texts)
+
     def get_dimension(self) -> int:
         return self.dimension
@@ -1,20 +1,39 @@
 """
 OpenAI embeddings implementation.
 """
-from typing import List, Union
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
 from openai import OpenAI, AsyncOpenAI
 from openai import APIError as OpenAIAPIError
 
+from app.core.config import EMBED_CONCURRENCY, OPENAI_MAX_RETRIES, OPENAI_USAGE_TIER
 from app.services.embeddings.base import BaseEmbeddingModel
-from app.core.exceptions import LLMProviderError
+from app.core.http_pool import get_async_http_client
+from app.core.exceptions import ConfigurationError, LLMProviderError
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Embedding requests allowed in flight per process, by OpenAI usage tier:
+# roughly the RPM limit spread over a typical request latency.
+TIER_CONCURRENCY = {
+    "free": 1,
+    "tier1": 35,
+    "tier2": 60,
+    "tier3": 60,
+    "tier4": 125,
+    "tier5": 125,
+}
+
 
 class OpenAIEmbeddings(BaseEmbeddingModel):
     """OpenAI embeddings model."""
     
+    provider_name = "openai"
+    
     # Model dimensions (text-embedding-3-small, text-embedding-3-large, text-embedding-ada-002)
     MODEL_DIMENSIONS = {
         "text-embedding-3-small": 1536,
@@ -22,11 +41,51 @@ class OpenAIEmbeddings(BaseEmbeddingModel):
         "text-embedding-ada-002": 1536,
     }
     
-    def __init__(self, api_key: str, model_name: str = "text-embedding-3-small"):
+    # Most inputs the embeddings endpoint accepts in one request
+    MAX_BATCH_SIZE = 2048
+    
+    # Shared by every instance with the same tier (one account's rate limit);
+    # asyncio semaphores are bound to a loop, so there is one per loop.
+    _thread_limits: Dict[int, threading.BoundedSemaphore] = {}
+    _loop_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, asyncio.Semaphore]]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _limits_lock = threading.Lock()
+    
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "text-embedding-3-small",
+        batch_size: int = MAX_BATCH_SIZE,
+        max_concurrency: int = EMBED_CONCURRENCY,
+        openai_usage_tier: str = OPENAI_USAGE_TIER,
+    ):
+        """
+        Args:
+            api_key: OpenAI API key
+            model_name: Embedding model
+            batch_size: Texts per request (capped at ``MAX_BATCH_SIZE``)
+            max_concurrency: Requests one ``embed``/``embed_async`` call keeps in flight
+            openai_usage_tier: Account tier; caps requests in flight across
+                all instances (see ``TIER_CONCURRENCY``)
+        """
         super().__init__(model_name)
+        if openai_usage_tier not in TIER_CONCURRENCY:
+            raise ConfigurationError(
+                f"Unknown OpenAI usage tier: {openai_usage_tier}",
+                details={"supported_tiers": list(TIER_CONCURRENCY)},
+            )
         self.api_key = api_key
-        self.client = OpenAI(api_key=api_key)
-        self.async_client = AsyncOpenAI(api_key=api_key)
+        self.batch_size = max(1, min(batch_size, self.MAX_BATCH_SIZE))
+        self.tier_limit = TIER_CONCURRENCY[openai_usage_tier]
+        self.max_concurrency = max(1, min(max_concurrency, self.tier_limit))
+        # The SDK retries 429s with exponential backoff and honors Retry-After.
+        self.client = OpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES)
+        self.async_client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=OPENAI_MAX_RETRIES,
+            http_client=get_async_http_client(),
+        )
         self.dimension = self.MODEL_DIMENSIONS.get(model_name, 1536)
     
     def embed(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
@@ -39,19 +98,43 @@ class OpenAIEmbeddings(BaseEmbeddingModel):
         Returns:
             Single embedding vector or list of embedding vectors
         """
-        is_single = isinstance(text, str)
-        texts = [text] if is_single else text
+        if isinstance(text, str):
+            return self._create([text])[0]
+        
+        texts = text
+        if len(texts) <= self.batch_size:
+            return self._create(texts)
         
+        starts = range(0, len(texts), self.batch_size)
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(starts))) as pool:
+            batches = pool.map(lambda start: self._create(texts[start:start + self.batch_size]), starts)
+            return [embedding for batch in batches for embedding in batch]
+    
+    def _thread_limit(self) -> threading.BoundedSemaphore:
+        with self._limits_lock:
+            limit = self._thread_limits.get(self.tier_limit)
+            if limit is None:
+                limit = self._thread_limits[self.tier_limit] = threading.BoundedSemaphore(self.tier_limit)
+            return limit
+    
+    def _loop_limit(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._limits_lock:
+            limits = self._loop_limits.setdefault(loop, {})
+            limit = limits.get(self.tier_limit)
+            if limit is None:
+                limit = limits[self.tier_limit] = asyncio.Semaphore(self.tier_limit)
+            return limit
+    
+    def _create(self, texts: List[str]) -> List[List[float]]:
+        """One embeddings request, within the tier's in-flight limit."""
         try:
-            response = self.client.embeddings.create(
-                model=self.model_name,
-                input=texts,
-            )
-            
-            embeddings = [item.embedding for item in response.data]
-            
-            return embeddings[0] if is_single else embeddings
-            
+            with self._thread_limit():
+                response = self.client.embeddings.create(
+                    model=self.model_name,
+                    input=texts,
+                )
+            return [item.embedding for item in response.data]
         except OpenAIAPIError as e:
             logger.error(f"OpenAI embeddings error: {e}", extra={"model": self.model_name})
             raise LLMProviderError(
@@ -69,20 +152,39 @@ class OpenAIEmbeddings(BaseEmbeddingModel):
             )
     
     async def embed_async(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
-        """Async version of embed()."""
-        is_single = isinstance(text, str)
-        texts = [text] if is_single else text
+        """
+        Async version of embed().
+        
+        Lists longer than ``batch_size`` are sent as several requests, up to
+        ``max_concurrency`` at a time; vectors keep input order.
+        """
+        if isinstance(text, str):
+            return (await self._create_async([text]))[0]
+        
+        texts = text
+        if len(texts) <= self.batch_size:
+            return await self._create_async(texts)
+        
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
         
+        async def run(start: int) -> None:
+            async with semaphore:
+                batch = await self._create_async(texts[start:start + self.batch_size])
+            embeddings[start:start + len(batch)] = batch
+        
+        await asyncio.gather(*(run(start) for start in range(0, len(texts), self.batch_size)))
+        return embeddings
+    
+    async def _create_async(self, texts: List[str]) -> List[List[float]]:
+        """One embeddings request, within the tier's in-flight limit."""
         try:
-            response = await self.async_client.embeddings.create(
-                model=self.model_name,
-                input=texts,
-            )
-            
-            embeddings = [item.embedding for item in response.data]
-            
-            return embeddings[0] if is_single else embeddings
-            
+            async with self._loop_limit():
+                response = await self.async_client.embeddings.create(
+                    model=self.model_name,
+                    input=texts,
+                )
+            return [item.embedding for item in response.data]
         except OpenAIAPIError as e:
             logger.error(f"OpenAI async embeddings error: {e}", extra={"model": self.model_name})
             raise LLMProviderError(
@@ -1,7 +1,9 @@
 """
 Main evaluation orchestrator.
 """
+import asyncio
 import uuid
+from collections import defaultdict
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import json
@@ -64,10 +66,58 @@ class Evaluator:
         
         return results
     
+    async def evaluate_single_async(
+        self,
+        question: str,
+        expected_answer: Optional[str],
+        actual_answer: str,
+        context: Optional[List[str]] = None,
+    ) -> List[EvaluationResult]:
+        """
+        Async version of evaluate_single().
+        
+        Metrics with an ``evaluate_async`` method are awaited; the others run
+        in a worker thread. Results stay in metric order.
+        """
+        async def run(metric: BaseEvaluator) -> EvaluationResult:
+            kwargs = dict(
+                question=question,
+                expected_answer=expected_answer,
+                actual_answer=actual_answer,
+                context=context,
+            )
+            try:
+                evaluate_async = getattr(metric, "evaluate_async", None)
+                if evaluate_async is not None:
+                    return await evaluate_async(**kwargs)
+                return await asyncio.to_thread(metric.evaluate, **kwargs)
+            except Exception as e:
+                logger.error(
+                    f"Error evaluating with {metric.get_metric_name()}: {e}",
+                    exc_info=True
+                )
+                return EvaluationResult(
+                    metric_name=metric.get_metric_name(),
+                    score=0.0,
+                    details={"error": str(e)}
+                )
+        
+        return list(await asyncio.gather(*(run(metric) for metric in self.metrics)))
+    
+    @staticmethod
+    def _item_kwargs(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "question": item.get("question", ""),
+            "expected_answer": item.get("expected_answer"),
+            "actual_answer": item.get("actual_answer", ""),
+            "context": item.get("context"),
+        }
+    
     def evaluate_batch(
         self,
         test_set: List[Dict[str, Any]],
         test_set_name: str = "default",
+        keep_details: bool = True,
     ) -> EvaluationReport:
         """
         Evaluate a batch of Q&A pairs.
@@ -75,12 +125,15 @@ class Evaluator:
         Args:
             test_set: List of dicts with keys: question, expected_answer (optional), actual_answer, context (optional)
             test_set_name: Name for this test set
+            keep_details: Keep every per-item result in ``report.results``;
+                large runs can pass False and keep only the averages
             
         Returns:
             EvaluationReport with aggregated results
         """
         evaluation_id = str(uuid.uuid4())
         all_results = []
+        totals = self._new_totals()
         
         logger.info(
             f"Starting batch evaluation",
@@ -92,34 +145,82 @@ class Evaluator:
         )
         
         for idx, item in enumerate(test_set):
-            question = item.get("question", "")
-            expected_answer = item.get("expected_answer")
-            actual_answer = item.get("actual_answer", "")
-            context = item.get("context")
+            results = self.evaluate_single(**self._item_kwargs(item))
             
-            results = self.evaluate_single(
-                question=question,
-                expected_answer=expected_answer,
-                actual_answer=actual_answer,
-                context=context,
-            )
-            
-            all_results.extend(results)
+            self._tally(totals, results)
+            if keep_details:
+                all_results.extend(results)
             
             if (idx + 1) % 10 == 0:
                 logger.info(f"Evaluated {idx + 1}/{len(test_set)} questions")
         
-        # Calculate overall scores per metric
-        metric_scores: Dict[str, List[float]] = {}
-        for result in all_results:
-            if result.metric_name not in metric_scores:
-                metric_scores[result.metric_name] = []
-            metric_scores[result.metric_name].append(result.score)
+        return self._build_report(evaluation_id, test_set_name, len(test_set), all_results, totals)
+    
+    async def evaluate_batch_async(
+        self,
+        test_set: List[Dict[str, Any]],
+        test_set_name: str = "default",
+        concurrency: int = 16,
+        keep_details: bool = True,
+    ) -> EvaluationReport:
+        """
+        Async version of evaluate_batch() with up to ``concurrency`` items in flight.
+        
+        Worth it when metrics wait on an LLM or embedding API; the report is
+        the same as evaluate_batch() (results in test-set order).
+        """
+        evaluation_id = str(uuid.uuid4())
+        
+        logger.info(
+            f"Starting batch evaluation",
+            extra={
+                "evaluation_id": evaluation_id,
+                "test_set_name": test_set_name,
+                "num_questions": len(test_set),
+                "concurrency": concurrency,
+            }
+        )
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run(item: Dict[str, Any]) -> List[EvaluationResult]:
+            async with semaphore:
+                return await self.evaluate_single_async(**self._item_kwargs(item))
         
-        # Calculate averages
+        per_item = await asyncio.gather(*(run(item) for item in test_set))
+        totals = self._new_totals()
+        all_results = []
+        for results in per_item:
+            self._tally(totals, results)
+            if keep_details:
+                all_results.extend(results)
+        
+        return self._build_report(evaluation_id, test_set_name, len(test_set), all_results, totals)
+    
+    @staticmethod
+    def _new_totals() -> Dict[str, List[float]]:
+        """Running ``[score sum, count]`` per metric name."""
+        return defaultdict(lambda: [0.0, 0])
+    
+    @staticmethod
+    def _tally(totals: Dict[str, List[float]], results: List[EvaluationResult]) -> None:
+        for result in results:
+            running = totals[result.metric_name]
+            running[0] += result.score
+            running[1] += 1
+    
+    def _build_report(
+        self,
+        evaluation_id: str,
+        test_set_name: str,
+        total_questions: int,
+        all_results: List[EvaluationResult],
+        totals: Dict[str, List[float]],
+    ) -> EvaluationReport:
+        """Turn running per-metric totals into averages and an EvaluationReport."""
         metric_averages = {
-            metric_name: sum(scores) / len(scores)
-            for metric_name, scores in metric_scores.items()
+            metric_name: score_sum / count
+            for metric_name, (score_sum, count) in totals.items()
         }
         
         overall_score = sum(metric_averages.values()) / len(metric_averages) if metric_averages else None
@@ -127,7 +228,7 @@ class Evaluator:
         report = EvaluationReport(
             evaluation_id=evaluation_id,
             test_set_name=test_set_name,
-            total_questions=len(test_set),
+            total_questions=total_questions,
             results=all_results,
             overall_score=overall_score,
             metadata={
@@ -153,7 +254,7 @@ class Evaluator:
         path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(path, "w") as f:
-            json.dump(report.dict(), f, indent=2, default=str)
+            json.dump(report.model_dump(), f, indent=2, default=str)
         
         logger.info(f"Saved evaluation report to {filepath}")
     
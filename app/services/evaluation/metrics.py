@@ -9,6 +9,8 @@ from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_TOKEN_RE = re.compile(r'\b\w+\b')
+
 
 class ExactMatchEvaluator(BaseEvaluator):
     """Exact string match evaluation."""
@@ -52,9 +54,25 @@ class F1ScoreEvaluator(BaseEvaluator):
     
     def _tokenize(self, text: str) -> set:
         """Simple tokenization (whitespace + punctuation)."""
-        tokens = re.findall(r'\b\w+\b', text.lower())
+        tokens = _TOKEN_RE.findall(text.lower())
         return set(tokens)
     
+    def _scores(self, expected_tokens: set, actual_tokens: set, common: int) -> EvaluationResult:
+        precision = common / len(actual_tokens) if actual_tokens else 0.0
+        recall = common / len(expected_tokens)
+        f1 = 0.0 if precision + recall == 0 else 2 * (precision * recall) / (precision + recall)
+        return EvaluationResult(
+            metric_name=self.get_metric_name(),
+            score=f1,
+            details={
+                "precision": precision,
+                "recall": recall,
+                "expected_tokens": len(expected_tokens),
+                "actual_tokens": len(actual_tokens),
+                "common_tokens": common,
+            }
+        )
+    
     def evaluate(
         self,
         question: str,
@@ -80,32 +98,7 @@ class F1ScoreEvaluator(BaseEvaluator):
                 details={"error": "Expected answer has no tokens"}
             )
         
-        # Calculate precision, recall, F1
-        intersection = expected_tokens & actual_tokens
-        
-        if not actual_tokens:
-            precision = 0.0
-        else:
-            precision = len(intersection) / len(actual_tokens)
-        
-        recall = len(intersection) / len(expected_tokens)
-        
-        if precision + recall == 0:
-            f1 = 0.0
-        else:
-            f1 = 2 * (precision * recall) / (precision + recall)
-        
-        return EvaluationResult(
-            metric_name=self.get_metric_name(),
-            score=f1,
-            details={
-                "precision": precision,
-                "recall": recall,
-                "expected_tokens": len(expected_tokens),
-                "actual_tokens": len(actual_tokens),
-                "common_tokens": len(intersection),
-            }
-        )
+        return self._scores(expected_tokens, actual_tokens, len(expected_tokens & actual_tokens))
 
 
 class SemanticSimilarityEvaluator(BaseEvaluator):
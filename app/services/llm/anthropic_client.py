@@ -6,7 +6,8 @@ from typing import Optional, Iterator, AsyncIterator
 from anthropic import Anthropic, AsyncAnthropic
 from anthropic import APIError as AnthropicAPIError
 
-from app.services.llm.base import BaseLLMClient, LLMResponse
+from app.services.llm.base import BaseLLMClient, LLMResponse, buffered_stream
+from app.core.http_pool import get_async_http_client
 from app.core.exceptions import LLMProviderError
 from app.core.logging_config import get_logger
 
@@ -19,7 +20,24 @@ class AnthropicClient(BaseLLMClient):
     def __init__(self, api_key: str, model: str = "claude-3-haiku-20240307"):
         super().__init__(api_key, model)
         self.client = Anthropic(api_key=api_key)
-        self.async_client = AsyncAnthropic(api_key=api_key)
+        self.async_client = AsyncAnthropic(api_key=api_key, http_client=get_async_http_client())
+    
+    def _message_kwargs(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> dict:
+        kwargs = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens or 1024,
+        }
+        if system_prompt:
+            kwargs["system"] = system_prompt
+        return kwargs
     
     def ask(
         self,
@@ -31,18 +49,8 @@ class AnthropicClient(BaseLLMClient):
         """Synchronous completion."""
         start_time = time.time()
         
-        messages = [{"role": "user", "content": prompt}]
-        
         try:
-            kwargs = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens or 1024,
-            }
-            
-            if system_prompt:
-                kwargs["system"] = system_prompt
+            kwargs = self._message_kwargs(prompt, system_prompt, temperature, max_tokens)
             
             response = self.client.messages.create(**kwargs)
             
@@ -81,19 +89,15 @@ class AnthropicClient(BaseLLMClient):
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
     ) -> Iterator[str]:
-        """Streaming completion."""
-        messages = [{"role": "user", "content": prompt}]
+        """
+        Streaming completion.
         
+        To build the whole text, collect the chunks and join once
+        (``buffered_stream``) rather than ``+=`` per chunk; ``stream_joined``
+        does that and also returns usage.
+        """
         try:
-            kwargs = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens or 1024,
-            }
-            
-            if system_prompt:
-                kwargs["system"] = system_prompt
+            kwargs = self._message_kwargs(prompt, system_prompt, temperature, max_tokens)
             
             with self.client.messages.stream(**kwargs) as stream:
                 for text_event in stream.text_stream:
@@ -106,6 +110,39 @@ class AnthropicClient(BaseLLMClient):
                 status_code=getattr(e, "status_code", 500),
             )
     
+    def stream_joined(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> LLMResponse:
+        """Streaming completion collected into one LLMResponse (chunks joined once at the end)."""
+        try:
+            kwargs = self._message_kwargs(prompt, system_prompt, temperature, max_tokens)
+            
+            with self.client.messages.stream(**kwargs) as stream:
+                content = buffered_stream(stream.text_stream)
+                response = stream.get_final_message()
+            
+            return LLMResponse(
+                content=content,
+                model=self.model,
+                provider="anthropic",
+                usage={
+                    "input_tokens": response.usage.input_tokens,
+                    "output_tokens": response.usage.output_tokens,
+                } if response.usage else None,
+                finish_reason=response.stop_reason,
+            )
+        except AnthropicAPIError as e:
+            logger.error(f"Anthropic streaming error: {e}", extra={"provider": "anthropic"})
+            raise LLMProviderError(
+                f"Anthropic streaming error: {str(e)}",
+                provider="anthropic",
+                status_code=getattr(e, "status_code", 500),
+            )
+    
     async def ask_async(
         self,
         prompt: str,
@@ -116,18 +153,8 @@ class AnthropicClient(BaseLLMClient):
         """Async completion."""
         start_time = time.time()
         
-        messages = [{"role": "user", "content": prompt}]
-        
         try:
-            kwargs = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens or 1024,
-            }
-            
-            if system_prompt:
-                kwargs["system"] = system_prompt
+            kwargs = self._message_kwargs(prompt, system_prompt, temperature, max_tokens)
             
             response = await self.async_client.messages.create(**kwargs)
             
@@ -159,18 +186,8 @@ class AnthropicClient(BaseLLMClient):
         max_tokens: Optional[int] = None,
     ) -> AsyncIterator[str]:
         """Async streaming completion."""
-        messages = [{"role": "user", "content": prompt}]
-        
         try:
-            kwargs = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens or 1024,
-            }
-            
-            if system_prompt:
-                kwargs["system"] = system_prompt
+            kwargs = self._message_kwargs(prompt, system_prompt, temperature, max_tokens)
             
             async with self.async_client.messages.stream(**kwargs) as stream:
                 async for text_event in stream.text_stream:
@@ -3,7 +3,7 @@ Base LLM client interface for provider abstraction.
 This ensures all providers implement the same contract.
 """
 from abc import ABC, abstractmethod
-from typing import AsyncIterator, Iterator, Optional
+from typing import AsyncIterator, Iterable, Iterator, Optional
 from pydantic import BaseModel
 
 
@@ -22,6 +22,11 @@ class LLMResponse(BaseModel):
     finish_reason: Optional[str] = None
 
 
+def buffered_stream(chunks: Iterable[str]) -> str:
+    """Whole text of a ``stream()``: chunks are collected and joined once, not concatenated per chunk."""
+    return "".join(chunks)
+
+
 class BaseLLMClient(ABC):
     """Abstract base class for all LLM providers."""
     
@@ -29,6 +34,16 @@ class BaseLLMClient(ABC):
         self.api_key = api_key
         self.model = model
         self.provider_name = self.__class__.__name__.replace("Client", "").lower()
+
+    async def aclose(self) -> None:
+        """Release pooled connections held by the client.
+
+        ``async_client`` runs on the shared pool from ``app.core.http_pool``,
+        which is closed on its own at shutdown, so only ``client`` is closed here.
+        """
+        client = getattr(self, "client", None)
+        if client is not None:
+            client.close()
     
     @abstractmethod
     def ask(
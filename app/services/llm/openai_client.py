@@ -7,6 +7,7 @@ from openai import OpenAI, AsyncOpenAI
 from openai import APIError as OpenAIAPIError
 
 from app.services.llm.base import BaseLLMClient, LLMResponse
+from app.core.http_pool import get_async_http_client
 from app.core.exceptions import LLMProviderError
 from app.core.logging_config import get_logger
 
@@ -19,7 +20,7 @@ class OpenAIClient(BaseLLMClient):
     def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
         super().__init__(api_key, model)
         self.client = OpenAI(api_key=api_key)
-        self.async_client = AsyncOpenAI(api_key=api_key)
+        self.async_client = AsyncOpenAI(api_key=api_key, http_client=get_async_http_client())
     
     def ask(
         self,
@@ -1,7 +1,7 @@
 """
 LLM Router - Factory for creating and managing LLM clients.
 """
-from typing import Optional
+from typing import Dict, Optional
 from app.core.config import LLM_PROVIDER, OPENAI_API_KEY, ANTHROPIC_API_KEY
 from app.services.llm.openai_client import OpenAIClient
 from app.services.llm.anthropic_client import AnthropicClient
@@ -11,8 +11,17 @@ from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-# Singleton client instance
-_llm_client: Optional[BaseLLMClient] = None
+# One cached client per provider, so alternating providers doesn't rebuild
+# clients (and their connection pools) on every request.
+_llm_clients: Dict[str, BaseLLMClient] = {}
+_CLIENT_CLASSES = {
+    "openai": (OpenAIClient, "OPENAI_API_KEY"),
+    "anthropic": (AnthropicClient, "ANTHROPIC_API_KEY"),
+}
+
+
+def _configured_key(provider: str) -> Optional[str]:
+    return {"openai": OPENAI_API_KEY, "anthropic": ANTHROPIC_API_KEY}[provider]
 
 
 def get_llm_client(
@@ -20,10 +29,11 @@ def get_llm_client(
     api_key: Optional[str] = None,
 ) -> BaseLLMClient:
     """
-    Get or create LLM client instance (singleton pattern).
+    Get or create LLM client instance (cached per provider).
     
     Args:
         provider: Override default provider from config
+        api_key: Caller-supplied key; such clients are built per call and not cached
         
     Returns:
         BaseLLMClient instance
@@ -31,49 +41,46 @@ def get_llm_client(
     Raises:
         ConfigurationError: If provider or API key is missing
     """
-    global _llm_client
-    
     provider = provider or LLM_PROVIDER
     
-    # Return existing client if provider matches and no override key
-    if not api_key and _llm_client and _llm_client.provider_name == provider:
-        return _llm_client
+    # Return existing client if no override key
+    if not api_key:
+        client = _llm_clients.get(provider)
+        if client is not None:
+            return client
     
-    # Create new client
-    if provider == "openai":
-        resolved_key = api_key or OPENAI_API_KEY
-        if not resolved_key:
-            raise ConfigurationError(
-                "OPENAI_API_KEY not found in environment variables",
-                details={"provider": "openai"}
-            )
-        if api_key:
-            return OpenAIClient(api_key=resolved_key)
-        _llm_client = OpenAIClient(api_key=resolved_key)
-        logger.info("Initialized OpenAI client", extra={"provider": "openai", "model": _llm_client.model})
-        
-    elif provider == "anthropic":
-        resolved_key = api_key or ANTHROPIC_API_KEY
-        if not resolved_key:
-            raise ConfigurationError(
-                "ANTHROPIC_API_KEY not found in environment variables",
-                details={"provider": "anthropic"}
-            )
-        if api_key:
-            return AnthropicClient(api_key=resolved_key)
-        _llm_client = AnthropicClient(api_key=resolved_key)
-        logger.info("Initialized Anthropic client", extra={"provider": "anthropic", "model": _llm_client.model})
-        
-    else:
+    if provider not in _CLIENT_CLASSES:
         raise ConfigurationError(
             f"Unsupported LLM provider: {provider}",
-            details={"supported_providers": ["openai", "anthropic"]}
+            details={"supported_providers": list(_CLIENT_CLASSES)}
         )
     
-    return _llm_client
+    client_class, key_name = _CLIENT_CLASSES[provider]
+    resolved_key = api_key or _configured_key(provider)
+    if not resolved_key:
+        raise ConfigurationError(
+            f"{key_name} not found in environment variables",
+            details={"provider": provider}
+        )
+    if api_key:
+        return client_class(api_key=resolved_key)
+    
+    client = _llm_clients.setdefault(provider, client_class(api_key=resolved_key))
+    logger.info(f"Initialized {provider} client", extra={"provider": provider, "model": client.model})
+    return client
+
+
+async def close_clients() -> None:
+    """Close cached clients and their HTTP pools (called on shutdown)."""
+    clients = list(_llm_clients.values())
+    _llm_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close {client.provider_name} client: {e}")
 
 
 def reset_client() -> None:
-    """Reset the singleton client (useful for testing)."""
-    global _llm_client
-    _llm_client = None
+    """Reset the cached clients (useful for testing)."""
+    _llm_clients.clear()
@@ -11,6 +11,22 @@ from app.core.config import OPENAI_API_KEY, EMBEDDING_PROVIDER
 
 logger = get_logger(__name__)
 
+# Fixed instructions lead every prompt, byte-identical across calls, so
+# providers that cache prompt prefixes can reuse them; the retrieved context
+# and the question (the parts that vary) come last.
+_CONTEXT_INSTRUCTIONS = (
+    "Use the following context to answer the question. "
+    "If the context doesn't contain enough information, say so."
+)
+_NO_CONTEXT_INSTRUCTIONS = "Answer the question as best you can."
+
+
+def _build_prompt(question: str, context: str, system_prompt: Optional[str] = None) -> str:
+    """Instructions, then context (when any was retrieved), then the question."""
+    if context:
+        return f"{system_prompt or _CONTEXT_INSTRUCTIONS}\n\nContext:\n{context}\n\nQuestion: {question}\n\nAnswer:"
+    return f"{system_prompt or _NO_CONTEXT_INSTRUCTIONS}\n\nQuestion: {question}\n\nAnswer:"
+
 
 class RAGPipeline:
     """RAG pipeline that combines retrieval and generation."""
@@ -40,6 +56,8 @@ class RAGPipeline:
         llm_provider: Optional[str] = None,
         llm_api_key: Optional[str] = None,
         embedding_api_key: Optional[str] = None,
+        top_k: Optional[int] = None,
+        context_window: Optional[int] = None,
     ) -> dict:
         """
         Execute RAG query: retrieve context and generate answer.
@@ -49,10 +67,16 @@ class RAGPipeline:
             system_prompt: Optional system prompt
             temperature: LLM temperature
             max_tokens: Maximum tokens to generate
+            top_k: Documents to retrieve for this call (defaults to ``self.top_k``)
+            context_window: Context length for this call (defaults to ``self.context_window``)
             
         Returns:
             Dictionary with answer, context, and metadata
         """
+        # Per-call overrides; the pipeline is shared across requests.
+        top_k = top_k or self.top_k
+        context_window = context_window or self.context_window
+        
         # Step 1: Generate query embedding (optional)
         search_results: List[SearchResult] = []
         embedding_provider = EMBEDDING_PROVIDER
@@ -65,7 +89,7 @@ class RAGPipeline:
             vector_store = get_vector_store()
             search_results = vector_store.search(
                 query_embedding=query_embedding,
-                top_k=self.top_k,
+                top_k=top_k,
                 filter=filter,
             )
         else:
@@ -79,7 +103,7 @@ class RAGPipeline:
             chunk_text = result.document.content
             chunk_length = len(chunk_text)
             
-            if total_length + chunk_length > self.context_window:
+            if total_length + chunk_length > context_window:
                 break
             
             context_chunks.append(chunk_text)
@@ -88,38 +112,7 @@ class RAGPipeline:
         context = "\n\n".join(context_chunks)
         
         # Step 4: Build prompt with context
-        if context_chunks:
-            if system_prompt:
-                prompt = f"""{system_prompt}
-
-Context:
-{context}
-
-Question: {question}
-
-Answer:"""
-            else:
-                prompt = f"""Use the following context to answer the question. If the context doesn't contain enough information, say so.
-
-Context:
-{context}
-
-Question: {question}
-
-Answer:"""
-        else:
-            if system_prompt:
-                prompt = f"""{system_prompt}
-
-Question: {question}
-
-Answer:"""
-            else:
-                prompt = f"""Answer the question as best you can.
-
-Question: {question}
-
-Answer:"""
+        prompt = _build_prompt(question, context, system_prompt)
         
         # Step 5: Generate answer using LLM
         llm_client = get_llm_client(provider=llm_provider, api_key=llm_api_key)
@@ -155,8 +148,14 @@ Answer:"""
         llm_provider: Optional[str] = None,
         llm_api_key: Optional[str] = None,
         embedding_api_key: Optional[str] = None,
+        top_k: Optional[int] = None,
+        context_window: Optional[int] = None,
     ) -> dict:
         """Async version of query()."""
+        # Per-call overrides; the pipeline is shared across requests.
+        top_k = top_k or self.top_k
+        context_window = context_window or self.context_window
+        
         # Step 1: Generate query embedding (optional)
         search_results: List[SearchResult] = []
         embedding_provider = EMBEDDING_PROVIDER
@@ -169,7 +168,7 @@ Answer:"""
             vector_store = get_vector_store()
             search_results = vector_store.search(
                 query_embedding=query_embedding,
-                top_k=self.top_k,
+                top_k=top_k,
                 filter=filter,
             )
         else:
@@ -183,7 +182,7 @@ Answer:"""
             chunk_text = result.document.content
             chunk_length = len(chunk_text)
             
-            if total_length + chunk_length > self.context_window:
+            if total_length + chunk_length > context_window:
                 break
             
             context_chunks.append(chunk_text)
@@ -192,38 +191,7 @@ Answer:"""
         context = "\n\n".join(context_chunks)
         
         # Step 4: Build prompt
-        if context_chunks:
-            if system_prompt:
-                prompt = f"""{system_prompt}
-
-Context:
-{context}
-
-Question: {question}
-
-Answer:"""
-            else:
-                prompt = f"""Use the following context to answer the question. If the context doesn't contain enough information, say so.
-
-Context:
-{context}
-
-Question: {question}
-
-Answer:"""
-        else:
-            if system_prompt:
-                prompt = f"""{system_prompt}
-
-Question: {question}
-
-Answer:"""
-            else:
-                prompt = f"""Answer the question as best you can.
-
-Question: {question}
-
-Answer:"""
+        prompt = _build_prompt(question, context, system_prompt)
         
         # Step 5: Generate answer
         llm_client = get_llm_client(provider=llm_provider, api_key=llm_api_key)
@@ -1,6 +1,8 @@
 """
 SEC EDGAR API client.
 """
+import asyncio
+import importlib.util
 import os
 import re
 import time
@@ -26,7 +28,14 @@ class FilingSearchResult:
 
 
 class EdgarClient:
-    """Minimal EDGAR client for search and filing download."""
+    """Minimal EDGAR client for search and filing download.
+
+    All instances share one pooled ``httpx.AsyncClient`` (HTTP/2 when ``h2``
+    is installed), so repeated searches and downloads reuse warm TLS
+    connections to the SEC hosts. Close it with ``aclose`` on shutdown.
+    """
+
+    _http: Optional[httpx.AsyncClient] = None
 
     def __init__(self):
         self._last_request_ts = 0.0
@@ -44,27 +53,43 @@ class EdgarClient:
             raise ValueError("Invalid accession number format")
         return accession_number
 
-    def _throttle(self) -> None:
-        min_interval = 1.0 / self._rate_limit
+    async def _throttle(self) -> None:
+        # Reserve the next request slot before sleeping, so concurrent
+        # callers queue up one interval apart instead of all firing at once.
         now = time.monotonic()
-        elapsed = now - self._last_request_ts
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self._last_request_ts = time.monotonic()
+        slot = max(now, self._last_request_ts + 1.0 / self._rate_limit)
+        self._last_request_ts = slot
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _client(self) -> httpx.AsyncClient:
+        if EdgarClient._http is None or EdgarClient._http.is_closed:
+            EdgarClient._http = httpx.AsyncClient(
+                timeout=30.0,
+                headers=self._headers,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+                http2=importlib.util.find_spec("h2") is not None,
+            )
+        return EdgarClient._http
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the shared HTTP pool (called on shutdown)."""
+        if cls._http is not None:
+            await cls._http.aclose()
+        cls._http = None
 
     async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        self._throttle()
-        async with httpx.AsyncClient(timeout=30.0, headers=self._headers) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+        await self._throttle()
+        response = await self._client().get(url, params=params)
+        response.raise_for_status()
+        return response.json()
 
     async def _get_text(self, url: str) -> str:
-        self._throttle()
-        async with httpx.AsyncClient(timeout=30.0, headers=self._headers) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.text
+        await self._throttle()
+        response = await self._client().get(url)
+        response.raise_for_status()
+        return response.text
 
     async def search_filings(
         self,
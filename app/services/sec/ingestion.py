@@ -3,15 +3,18 @@ SEC filing ingestion pipeline.
 """
 import json
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.executors import run_upload_work
 from app.core.logging_config import get_logger
 from app.database.models import SECCompany, SECFiling
 from app.database.repositories import DocumentRepository
-from app.services.document_processor.processor import DocumentProcessor
+from app.services.document_processor.processor import DocumentChunk, DocumentProcessor
 from app.services.embeddings.embedding_router import get_embedding_model
+from app.services.embeddings.embedding_cache import get_or_compute_embeddings_async
 from app.services.vector_store.vector_store_router import get_vector_store
 from app.services.vector_store.base import Document as VectorDocument
 from app.services.sec.edgar_client import EdgarClient
@@ -23,10 +26,19 @@ logger = get_logger(__name__)
 class SECFilingIngestionService:
     """Ingest SEC filings into the vector store."""
 
-    def __init__(self):
-        self.client = EdgarClient()
+    def __init__(self, client: Optional[EdgarClient] = None):
+        self.client = client or EdgarClient()
         self.processor = DocumentProcessor(chunk_size=1200, chunk_overlap=200, chunk_strategy="sentence")
 
+    def _chunk_filing(self, html: str, metadata: Dict[str, Any]) -> List[DocumentChunk]:
+        """Convert filing HTML to text and chunk it section by section."""
+        chunks = []
+        for section in extract_sections(html_to_text(html)):
+            chunks.extend(
+                self.processor.process_text(section.text, metadata={**metadata, "filing_section": section.title})
+            )
+        return chunks
+
     def _get_or_create_company(self, db: Session, cik: str, company_name: Optional[str]) -> SECCompany:
         company = db.query(SECCompany).filter(SECCompany.cik == cik).first()
         if company:
@@ -40,8 +52,12 @@ class SECFilingIngestionService:
             company_name=company_name,
         )
         db.add(company)
-        db.commit()
-        db.refresh(company)
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent ingest created the same CIK first; use its row.
+            db.rollback()
+            company = db.query(SECCompany).filter(SECCompany.cik == cik).one()
         return company
 
     async def ingest_filing(
@@ -74,11 +90,8 @@ class SECFilingIngestionService:
         if not existing:
             db.add(filing)
         db.commit()
-        db.refresh(filing)
 
         html = await self.client.download_primary_filing_html(cik=cik_padded, accession_number=accession_number)
-        text = html_to_text(html)
-        sections = extract_sections(text)
 
         db_document = DocumentRepository.create_document(
             db=db,
@@ -88,37 +101,33 @@ class SECFilingIngestionService:
             status="processing",
         )
 
-        chunks = []
-        for section in sections:
-            section_chunks = self.processor.process_text(
-                section.text,
-                metadata={
-                    "source_type": "sec_filing",
-                    "form_type": form_type,
-                    "cik": cik_padded,
-                    "accession_number": accession_number,
-                    "filed_date": filed_date,
-                    "filing_section": section.title,
-                },
-            )
-            chunks.extend(section_chunks)
+        # HTML cleanup and chunking are CPU-bound; keep them off the event loop.
+        chunks = await run_upload_work(
+            self._chunk_filing,
+            html,
+            {
+                "source_type": "sec_filing",
+                "form_type": form_type,
+                "cik": cik_padded,
+                "accession_number": accession_number,
+                "filed_date": filed_date,
+                "document_id": str(db_document.id),
+            },
+        )
 
         embedding_model = get_embedding_model()
         texts = [chunk.content for chunk in chunks]
-        embeddings = await embedding_model.embed_async(texts)
+        embeddings = await get_or_compute_embeddings_async(texts, embedding_model)
 
         vector_documents = []
         for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            chunk_id = f"{db_document.id}_chunk_{i}"
+            # Chunk indexes restart per section; renumber across the filing in place.
+            chunk.metadata["chunk_index"] = i
             vector_documents.append(
-                VectorDocument(
-                    id=chunk_id,
+                VectorDocument.model_construct(
+                    id=f"{db_document.id}_chunk_{i}",
                     content=chunk.content,
-                    metadata={
-                        **chunk.metadata,
-                        "document_id": str(db_document.id),
-                        "chunk_index": i,
-                    },
+                    metadata=chunk.metadata,
                     embedding=embedding,
                 )
             )
@@ -136,7 +145,6 @@ class SECFilingIngestionService:
         filing.document_id = db_document.id
         filing.status = "indexed"
         db.commit()
-        db.refresh(filing)
 
         logger.info(
             "SEC filing ingested",
@@ -1,6 +1,8 @@
 """
 Background ingestion queue helpers.
 """
+from typing import Optional
+
 from sqlalchemy.orm import Session
 
 from app.core.logging_config import get_logger
@@ -13,8 +15,8 @@ logger = get_logger(__name__)
 class SECFilingQueueProcessor:
     """Process SEC ingestion jobs."""
 
-    def __init__(self):
-        self.ingestor = SECFilingIngestionService()
+    def __init__(self, ingestor: Optional[SECFilingIngestionService] = None):
+        self.ingestor = ingestor or SECFilingIngestionService()
 
     async def process_next(self, db: Session) -> bool:
         job = SECIngestionJobRepository.claim_next_pending(db=db)
@@ -0,0 +1,95 @@
+"""
+In-process semantic cache for LLM completions.
+
+Prompts are embedded and compared against previously answered prompts by
+cosine similarity; a close enough match returns the stored response without
+calling the LLM.
+"""
+import time
+from threading import Lock
+from typing import Any, List, Optional
+
+import numpy as np
+
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SemanticCache:
+    """Flat inner-product index over L2-normalized prompt embeddings.
+
+    Vectors live in one preallocated ``(max_entries, dim)`` int8 matrix with a
+    per-row scale (a quarter of float32's memory; cosine error stays well
+    under 0.01), so a lookup is a single matrix-vector product. Entries only
+    match within the same ``scope`` (e.g. provider + system prompt + max
+    tokens), expire after ``ttl_seconds``, and the least recently used slot is
+    overwritten when full.
+    """
+
+    def __init__(self, threshold: float = 0.92, ttl_seconds: float = 3600.0, max_entries: int = 1000) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._scales = np.zeros(max_entries, dtype=np.float32)
+        self._scopes = np.zeros(max_entries, dtype=np.int64)
+        self._stored_at = np.zeros(max_entries, dtype=np.float64)
+        self._used_at = np.zeros(max_entries, dtype=np.float64)
+        self._responses: List[Any] = [None] * max_entries
+        self._size = 0
+
+    @staticmethod
+    def normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, scope: str, vector: np.ndarray) -> Optional[Any]:
+        """Return the cached response for the nearest in-scope prompt, if close enough."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._size or self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                return None
+            n = self._size
+            similarities = (self._vectors[:n] @ vector) * self._scales[:n]
+            stale = (self._scopes[:n] != hash(scope)) | (now - self._stored_at[:n] > self.ttl_seconds)
+            similarities[stale] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            self._used_at[best] = now
+            return self._responses[best]
+
+    def add(self, scope: str, vector: np.ndarray, response: Any) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                # First entry (or embedding model changed): size the index to it.
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.int8)
+                self._size = 0
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._used_at))
+            # Symmetric int8: the largest component maps to +-127.
+            scale = float(np.max(np.abs(vector))) / 127.0 or 1.0
+            self._vectors[slot] = np.rint(vector / scale)
+            self._scales[slot] = scale
+            self._scopes[slot] = hash(scope)
+            self._stored_at[slot] = now
+            self._used_at[slot] = now
+            self._responses[slot] = response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._size = 0
+            self._vectors = None
+            self._responses = [None] * self.max_entries
+
+    def __len__(self) -> int:
+        return self._size
@@ -36,6 +36,15 @@ class BaseVectorStore(ABC):
         """
         pass
     
+    def add_documents_bulk(self, documents: List[Document]) -> List[str]:
+        """
+        Add a large batch of documents (e.g. one whole upload) in one write.
+        
+        Stores with a faster bulk-load path override this; by default it is
+        ``add_documents``.
+        """
+        return self.add_documents(documents)
+    
     @abstractmethod
     def search(
         self,
@@ -51,13 +51,14 @@ class ChromaVectorStore(BaseVectorStore):
         embeddings = []
         
         for doc in documents:
-            if not doc.embedding:
+            if doc.embedding is None or not len(doc.embedding):
                 raise ValueError(f"Document {doc.id} missing embedding")
             
             ids.append(doc.id)
             contents.append(doc.content)
             metadatas.append(doc.metadata)
-            embeddings.append(doc.embedding)
+            # Chroma validates plain lists; convert array rows at this boundary.
+            embeddings.append(doc.embedding.tolist() if hasattr(doc.embedding, "tolist") else doc.embedding)
         
         try:
             self.collection.add(
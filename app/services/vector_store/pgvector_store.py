@@ -1,19 +1,25 @@
 """
 PostgreSQL + pgvector vector store implementation.
 """
-import json
 from typing import List, Dict, Any, Optional
+from sqlalchemy import cast, literal, select
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 
 from app.services.vector_store.base import BaseVectorStore, Document, SearchResult
 from app.database.models import DocumentChunk as DocumentChunkModel
+from app.database.pg_copy import supports_binary_copy
+from app.database.types import FastVector
+from app.database.repositories import COPY_THRESHOLD, DocumentChunkRepository, l2_normalize
 from app.database.database import SessionLocal
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Candidates fetched from the halfvec index per requested result, then
+# re-ranked at full precision.
+RERANK_FACTOR = 4
+
 
 class PgVectorStore(BaseVectorStore):
     """PostgreSQL + pgvector vector store implementation."""
@@ -24,117 +30,124 @@ class PgVectorStore(BaseVectorStore):
         logger.info("Initialized PostgreSQL vector store with pgvector")
     
     def add_documents(self, documents: List[Document]) -> List[str]:
-        """Add documents to PostgreSQL."""
+        """Add documents to PostgreSQL in a single multi-row INSERT."""
+        return self._write_documents(documents, bulk=False)
+    
+    def add_documents_bulk(self, documents: List[Document]) -> List[str]:
+        """Add documents with binary COPY once the batch reaches ``COPY_THRESHOLD`` rows."""
+        return self._write_documents(documents, bulk=True)
+    
+    def _write_documents(self, documents: List[Document], bulk: bool) -> List[str]:
         if not documents:
             return []
         
-        ids = []
         try:
-            for doc in documents:
-                if not doc.embedding:
-                    raise ValueError(f"Document {doc.id} missing embedding")
-                
-                # Parse document_id from metadata or use doc.id
-                document_id = doc.metadata.get("document_id") if doc.metadata else None
-                chunk_index = doc.metadata.get("chunk_index", 0) if doc.metadata else 0
-                
-                if not document_id:
-                    raise ValueError(f"Document {doc.id} missing document_id in metadata")
-                
-                from uuid import UUID
-                doc_uuid = UUID(document_id)
-                
-                # Create chunk record
-                filed_date = None
-                if doc.metadata:
-                    filed_date_value = doc.metadata.get("filed_date")
-                    if filed_date_value:
-                        try:
-                            if hasattr(filed_date_value, "date"):
-                                filed_date = filed_date_value
-                            else:
-                                from datetime import datetime
-                                filed_date = datetime.fromisoformat(str(filed_date_value)).date()
-                        except Exception:
-                            filed_date = None
-
-                chunk = DocumentChunkModel(
-                    id=UUID(doc.id) if self._is_uuid(doc.id) else None,
-                    document_id=doc_uuid,
-                    chunk_index=chunk_index,
-                    content=doc.content,
-                    content_preview=doc.content[:200] if doc.content else None,
-                    embedding=doc.embedding,
-                    chunk_metadata=json.dumps(doc.metadata) if doc.metadata else None,
-                    source_type=doc.metadata.get("source_type") if doc.metadata else None,
-                    form_type=doc.metadata.get("form_type") if doc.metadata else None,
-                    cik=doc.metadata.get("cik") if doc.metadata else None,
-                    accession_number=doc.metadata.get("accession_number") if doc.metadata else None,
-                    filed_date=filed_date,
-                    filing_section=doc.metadata.get("filing_section") if doc.metadata else None,
-                )
-                
-                self.db.add(chunk)
-                ids.append(doc.id)
-            
-            self.db.commit()
+            rows = [self._chunk_row(doc) for doc in documents]
+            # Normalize the whole batch in one vectorized pass.
+            unit_vectors = l2_normalize([row["embedding"] for row in rows])
+            if bulk and len(rows) >= COPY_THRESHOLD and supports_binary_copy(self.db):
+                # COPY encodes straight from the matrix; no per-row vectors needed.
+                DocumentChunkRepository.bulk_copy_chunks(self.db, rows, embeddings=unit_vectors)
+            else:
+                for row, vector in zip(rows, unit_vectors):
+                    row["embedding"] = vector
+                DocumentChunkRepository.insert_chunk_rows(self.db, rows)
             logger.info(f"Added {len(documents)} documents to PostgreSQL vector store")
-            return ids
+            return [doc.id for doc in documents]
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error adding documents to PostgreSQL: {e}", exc_info=True)
             raise
     
+    def _chunk_row(self, doc: Document) -> Dict[str, Any]:
+        """Build the document_chunks column dict for one vector document."""
+        if doc.embedding is None or not len(doc.embedding):
+            raise ValueError(f"Document {doc.id} missing embedding")
+        
+        metadata = doc.metadata or {}
+        # Parse document_id from metadata or use doc.id
+        document_id = metadata.get("document_id")
+        if not document_id:
+            raise ValueError(f"Document {doc.id} missing document_id in metadata")
+        
+        filed_date = None
+        filed_date_value = metadata.get("filed_date")
+        if filed_date_value:
+            try:
+                if hasattr(filed_date_value, "date"):
+                    filed_date = filed_date_value
+                else:
+                    from datetime import datetime
+                    filed_date = datetime.fromisoformat(str(filed_date_value)).date()
+            except Exception:
+                filed_date = None
+        
+        from uuid import UUID
+        from app.core.ids import uuid7
+        return {
+            "id": UUID(doc.id) if self._is_uuid(doc.id) else uuid7(),
+            "document_id": UUID(document_id),
+            "chunk_index": metadata.get("chunk_index", 0),
+            "content": doc.content,
+            "content_preview": doc.content[:200] if doc.content else None,
+            "embedding": doc.embedding,
+            "chunk_metadata": doc.metadata or None,
+            "source_type": metadata.get("source_type"),
+            "form_type": metadata.get("form_type"),
+            "cik": metadata.get("cik"),
+            "accession_number": metadata.get("accession_number"),
+            "filed_date": filed_date,
+            "filing_section": metadata.get("filing_section"),
+        }
+    
     def search(
         self,
         query_embedding: List[float],
         top_k: int = 5,
         filter: Optional[Dict[str, Any]] = None,
     ) -> List[SearchResult]:
-        """Search for similar documents using pgvector."""
+        """
+        Search for similar documents using pgvector.
+
+        Two stages: the HNSW index over ``embedding::halfvec`` (2 bytes per
+        dimension) picks ``top_k * RERANK_FACTOR`` candidates, which are then
+        re-ranked with the stored float32 vectors.
+        """
         try:
-            # Build query
-            query = self.db.query(
-                DocumentChunkModel,
-                func.cosine_distance(
-                    DocumentChunkModel.embedding,
-                    query_embedding
-                ).label('distance')
-            )
-            
-            # Apply filters if provided
-            if filter:
-                if 'document_id' in filter:
-                    from uuid import UUID
-                    query = query.filter(DocumentChunkModel.document_id == UUID(filter['document_id']))
-                if 'source_type' in filter:
-                    query = query.filter(DocumentChunkModel.source_type == filter['source_type'])
-                if 'form_type' in filter:
-                    query = query.filter(DocumentChunkModel.form_type == filter['form_type'])
-                if 'cik' in filter:
-                    query = query.filter(DocumentChunkModel.cik == filter['cik'])
-                if 'accession_number' in filter:
-                    query = query.filter(DocumentChunkModel.accession_number == filter['accession_number'])
-                if 'filed_date_from' in filter:
-                    query = query.filter(DocumentChunkModel.filed_date >= filter['filed_date_from'])
-                if 'filed_date_to' in filter:
-                    query = query.filter(DocumentChunkModel.filed_date <= filter['filed_date_to'])
+            embedding_column = DocumentChunkModel.embedding
+            dim = embedding_column.type.dim
+            query_vector = l2_normalize(query_embedding)
             
-            # Order by distance and limit
-            results = query.order_by('distance').limit(top_k).all()
+            # Stored vectors are unit length, so negative inner product (<#>)
+            # ranks like cosine distance.
+            candidates = (
+                select(DocumentChunkModel.id)
+                .where(*self._filter_conditions(filter))
+                .order_by(
+                    cast(embedding_column, HALFVEC(dim)).max_inner_product(
+                        cast(literal(query_vector, FastVector(dim)), HALFVEC(dim))
+                    )
+                )
+                .limit(top_k * RERANK_FACTOR)
+            )
+            results = (
+                self.db.query(
+                    DocumentChunkModel,
+                    embedding_column.max_inner_product(query_vector).label('distance'),
+                )
+                .filter(DocumentChunkModel.id.in_(candidates))
+                .order_by('distance')
+                .limit(top_k)
+                .all()
+            )
             
             search_results = []
             for chunk, distance in results:
-                # Convert distance to similarity score (1 - distance)
-                score = 1.0 - float(distance)
+                # <#> returns the negated inner product, i.e. -cosine similarity
+                score = -float(distance)
                 
                 # Parse metadata
-                metadata = {}
-                if chunk.chunk_metadata:
-                    try:
-                        metadata = json.loads(chunk.chunk_metadata)
-                    except:
-                        pass
+                metadata = chunk.chunk_metadata or {}
                 
                 document = Document(
                     id=str(chunk.id),
@@ -154,6 +167,29 @@ class PgVectorStore(BaseVectorStore):
             logger.error(f"Error searching PostgreSQL: {e}", exc_info=True)
             raise
     
+    @staticmethod
+    def _filter_conditions(filter: Optional[Dict[str, Any]]) -> List[Any]:
+        """Translate a search filter dict into WHERE clauses."""
+        if not filter:
+            return []
+        conditions = []
+        if 'document_id' in filter:
+            from uuid import UUID
+            conditions.append(DocumentChunkModel.document_id == UUID(filter['document_id']))
+        if 'source_type' in filter:
+            conditions.append(DocumentChunkModel.source_type == filter['source_type'])
+        if 'form_type' in filter:
+            conditions.append(DocumentChunkModel.form_type == filter['form_type'])
+        if 'cik' in filter:
+            conditions.append(DocumentChunkModel.cik == filter['cik'])
+        if 'accession_number' in filter:
+            conditions.append(DocumentChunkModel.accession_number == filter['accession_number'])
+        if 'filed_date_from' in filter:
+            conditions.append(DocumentChunkModel.filed_date >= filter['filed_date_from'])
+        if 'filed_date_to' in filter:
+            conditions.append(DocumentChunkModel.filed_date <= filter['filed_date_to'])
+        return conditions
+    
     def delete(self, ids: List[str]) -> bool:
         """Delete documents by IDs."""
         try:
@@ -189,12 +225,7 @@ class PgVectorStore(BaseVectorStore):
             ).first()
             
             if chunk:
-                metadata = {}
-                if chunk.chunk_metadata:
-                    try:
-                        metadata = json.loads(chunk.chunk_metadata)
-                    except:
-                        pass
+                metadata = chunk.chunk_metadata or {}
                 
                 return Document(
                     id=str(chunk.id),
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Add a partial index on api_keys(key_hash) for active keys.
+Lets the auth lookup use an index-only scan. Safe to run multiple times.
+"""
+import sys
+from pathlib import Path
+from sqlalchemy import inspect, text
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.database import engine
+
+INDEX_NAME = "ix_api_keys_active_hash"
+
+
+def main() -> None:
+    inspector = inspect(engine)
+    if "api_keys" not in inspector.get_table_names():
+        print("api_keys table not found; run init_db first.")
+        return
+
+    indexes = {index["name"] for index in inspector.get_indexes("api_keys")}
+    if INDEX_NAME in indexes:
+        print(f"✅ {INDEX_NAME} already exists.")
+        return
+
+    if engine.dialect.name == "postgresql":
+        # CONCURRENTLY cannot run inside a transaction block.
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+                "ON api_keys (key_hash) WHERE is_active"
+            ))
+    else:
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+                "ON api_keys (key_hash) WHERE is_active"
+            ))
+    print(f"✅ Added {INDEX_NAME} index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Add indexes for newest-first list endpoints and the SEC job claim query.
+New databases get these from init_db; this is for existing ones.
+Safe to run multiple times.
+"""
+import sys
+from pathlib import Path
+from sqlalchemy import inspect, text
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.database import engine
+
+# (table, index name, definition after ON <table>)
+INDEXES = [
+    ("documents", "ix_documents_created_at", "(created_at DESC)"),
+    ("documents", "ix_documents_user_created", "(user_id, created_at DESC)"),
+    ("queries", "ix_queries_user_created", "(user_id, created_at DESC)"),
+    ("sec_filings", "ix_sec_filings_filed_date_id", "(filed_date DESC, id DESC)"),
+    ("sec_ingestion_jobs", "ix_sec_jobs_pending_created_at", "(created_at) WHERE status = 'pending'"),
+]
+
+
+def main() -> None:
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    concurrently = "CONCURRENTLY " if engine.dialect.name == "postgresql" else ""
+
+    for table, name, definition in INDEXES:
+        if table not in tables:
+            print(f"{table} table not found; skipping {name}.")
+            continue
+        if name in {index["name"] for index in inspector.get_indexes(table)}:
+            print(f"✅ {name} already exists.")
+            continue
+        statement = text(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {table} {definition}")
+        if concurrently:
+            # CONCURRENTLY cannot run inside a transaction block.
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(statement)
+        else:
+            with engine.begin() as conn:
+                conn.execute(statement)
+        print(f"✅ Added {name} index.")
+
+
+if __name__ == "__main__":
+    main()
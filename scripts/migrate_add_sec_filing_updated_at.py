@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Add updated_at column to sec_filings (feeds the /sec/filings ETag).
+Safe to run multiple times.
+"""
+import sys
+from pathlib import Path
+from sqlalchemy import inspect, text
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.database import engine
+
+
+def main() -> None:
+    inspector = inspect(engine)
+    if "sec_filings" not in inspector.get_table_names():
+        print("sec_filings table not found; run init_db first.")
+        return
+
+    columns = {col["name"] for col in inspector.get_columns("sec_filings")}
+    if "updated_at" in columns:
+        print("✅ sec_filings.updated_at already exists.")
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE sec_filings ADD COLUMN updated_at TIMESTAMP"))
+        conn.execute(text("UPDATE sec_filings SET updated_at = created_at"))
+    print("✅ Added sec_filings.updated_at column.")
+
+
+if __name__ == "__main__":
+    main()
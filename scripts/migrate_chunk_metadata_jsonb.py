@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Convert document_chunks.chunk_metadata from TEXT to JSONB and add a GIN index.
+PostgreSQL only (SQLite stores JSON as text either way). Safe to run multiple times.
+"""
+import sys
+from pathlib import Path
+from sqlalchemy import inspect, text
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.database import engine
+
+INDEX_NAME = "ix_document_chunks_metadata"
+
+
+def main() -> None:
+    if engine.dialect.name != "postgresql":
+        print("Not PostgreSQL; nothing to migrate.")
+        return
+
+    inspector = inspect(engine)
+    if "document_chunks" not in inspector.get_table_names():
+        print("document_chunks table not found; run init_db first.")
+        return
+
+    columns = {column["name"]: column for column in inspector.get_columns("document_chunks")}
+    column_type = str(columns["chunk_metadata"]["type"]).upper()
+    if column_type == "JSONB":
+        print("✅ chunk_metadata is already JSONB.")
+    else:
+        # Rewrites the table under an ACCESS EXCLUSIVE lock; run in a quiet window.
+        with engine.begin() as conn:
+            conn.execute(text(
+                "ALTER TABLE document_chunks ALTER COLUMN chunk_metadata TYPE jsonb "
+                "USING NULLIF(chunk_metadata, '')::jsonb"
+            ))
+        print("✅ Converted chunk_metadata to JSONB.")
+
+    indexes = {index["name"] for index in inspector.get_indexes("document_chunks")}
+    if INDEX_NAME in indexes:
+        print(f"✅ {INDEX_NAME} already exists.")
+        return
+
+    # CONCURRENTLY cannot run inside a transaction block.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+            "ON document_chunks USING gin (chunk_metadata jsonb_path_ops)"
+        ))
+    print(f"✅ Added {INDEX_NAME} index.")
+
+
+if __name__ == "__main__":
+    main()
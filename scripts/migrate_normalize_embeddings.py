@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Rescale stored chunk embeddings to unit length and add an inner-product HNSW index
+over a halfvec cast of the embedding (search re-ranks with the float32 column).
+Search ranks by inner product, which equals cosine only on unit vectors.
+PostgreSQL only (requires pgvector >= 0.7). Safe to run multiple times.
+"""
+import sys
+from pathlib import Path
+from sqlalchemy import inspect, text
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.database import engine
+
+INDEX_NAME = "ix_document_chunks_embedding_hnsw"
+BATCH_SIZE = 5000
+
+
+def main() -> None:
+    if engine.dialect.name != "postgresql":
+        print("Not PostgreSQL; nothing to migrate.")
+        return
+
+    inspector = inspect(engine)
+    if "document_chunks" not in inspector.get_table_names():
+        print("document_chunks table not found; run init_db first.")
+        return
+
+    # Batched so a large table is not rewritten under one long transaction.
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            updated = conn.execute(text(
+                "UPDATE document_chunks SET embedding = l2_normalize(embedding) "
+                "WHERE id IN (SELECT id FROM document_chunks "
+                "WHERE embedding IS NOT NULL AND abs(vector_norm(embedding) - 1) > 1e-4 "
+                # Zero vectors stay zero after l2_normalize; matching them would loop forever.
+                "AND vector_norm(embedding) > 0 "
+                "LIMIT :batch)"
+            ), {"batch": BATCH_SIZE}).rowcount
+        total += updated
+        if updated < BATCH_SIZE:
+            break
+    print(f"✅ Normalized {total} embeddings.")
+
+    with engine.connect() as conn:
+        index_def = conn.execute(
+            text("SELECT indexdef FROM pg_indexes WHERE indexname = :name"),
+            {"name": INDEX_NAME},
+        ).scalar()
+    if index_def and "halfvec" in index_def:
+        print(f"✅ {INDEX_NAME} already exists.")
+        return
+
+    # CONCURRENTLY cannot run inside a transaction block.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if index_def:
+            # Replace an earlier full-precision index of the same name.
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}"))
+        conn.execute(text(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+            "ON document_chunks USING hnsw ((embedding::halfvec(1536)) halfvec_ip_ops)"
+        ))
+    print(f"✅ Added {INDEX_NAME} index.")
+
+
+if __name__ == "__main__":
+    main()
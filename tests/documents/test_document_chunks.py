@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import app.main as main
+from app.core.ids import uuid7
+from app.database import models
+from app.database.database import get_async_db
+from app.database.repositories import DocumentChunkRepository
+
+HEADERS = {"X-API-Key": "test-api-key"}
+
+
+@pytest.fixture()
+def chunks_db(app, tmp_path):
+    url = f"sqlite:///{tmp_path / 'chunks.db'}"
+    engine = create_engine(url)
+    models.Base.metadata.create_all(
+        bind=engine,
+        tables=[models.Document.__table__, models.DocumentChunk.__table__],
+    )
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"), poolclass=NullPool)
+    async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with async_session() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    main.rate_limiter.max_requests = 100
+    main.rate_limiter.reset()
+
+    db = sessionmaker(bind=engine)()
+    document = models.Document(filename="a.txt", file_size=3, file_type="txt", status="completed")
+    db.add(document)
+    db.flush()
+    # Inserted out of order: both readers sort by chunk_index.
+    for index in (2, 0, 1):
+        content = f"chunk {index} " * 50
+        db.add(
+            models.DocumentChunk(
+                id=uuid7(),
+                document_id=document.id,
+                chunk_index=index,
+                content=content,
+                content_preview=content[:200],
+            )
+        )
+    db.commit()
+    try:
+        yield db, document.id
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_get_chunks_by_document_streams_in_order(chunks_db):
+    db, document_id = chunks_db
+    chunks = DocumentChunkRepository.get_chunks_by_document(db, document_id, batch_size=2)
+    assert [chunk.chunk_index for chunk in chunks] == [0, 1, 2]
+
+
+def test_list_document_chunks_returns_previews(client, chunks_db):
+    _, document_id = chunks_db
+    response = client.get(f"/documents/{document_id}/chunks", headers=HEADERS)
+    assert response.status_code == 200
+    chunks = response.json()["data"]["chunks"]
+    assert [chunk["chunk_index"] for chunk in chunks] == [0, 1, 2]
+    assert set(chunks[0]) == {"id", "chunk_index", "content_preview"}
+    assert len(chunks[0]["content_preview"]) == 200
+
+
+def test_list_document_chunks_unknown_document(client, chunks_db):
+    response = client.get(f"/documents/{uuid7()}/chunks", headers=HEADERS)
+    assert response.status_code == 404
@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import app.main as main
+from app.database import models
+from app.database.database import get_async_db
+
+HEADERS = {"X-API-Key": "test-api-key"}
+
+
+@pytest.fixture()
+def filings_db(app, tmp_path):
+    url = f"sqlite:///{tmp_path / 'filings.db'}"
+    engine = create_engine(url)
+    models.Base.metadata.create_all(
+        bind=engine,
+        tables=[models.SECCompany.__table__, models.SECFiling.__table__],
+    )
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"), poolclass=NullPool)
+    async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with async_session() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    main.rate_limiter.max_requests = 100
+    main.rate_limiter.reset()
+
+    db = sessionmaker(bind=engine)()
+    company = models.SECCompany(cik="0000320193", company_name="Apple Inc.")
+    db.add(company)
+    db.flush()
+    db.add(
+        models.SECFiling(
+            accession_number="0000320193-24-000123",
+            company_id=company.id,
+            form_type="10-K",
+            filed_date=date(2024, 11, 1),
+            filing_url="",
+            status="downloading",
+        )
+    )
+    db.commit()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_filings_etag_changes_with_status(client, filings_db):
+    first = client.get("/sec/filings", headers=HEADERS)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    unchanged = client.get("/sec/filings", headers={**HEADERS, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    filing = filings_db.query(models.SECFiling).one()
+    filing.status = "failed"
+    filings_db.commit()
+
+    changed = client.get("/sec/filings", headers={**HEADERS, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["data"]["filings"][0]["status"] == "failed"
@@ -39,6 +39,7 @@ def test_require_api_key_invalid_raises(db_session, monkeypatch):
 def test_require_api_key_allows_env_key(db_session, monkeypatch):
     monkeypatch.setattr(security, "DEBUG", False)
     monkeypatch.setattr(security, "API_KEY", "env-key")
+    monkeypatch.setattr(security, "_API_KEY_BYTES", b"env-key")
 
     assert security.require_api_key(api_key="env-key", db=db_session) is None
 
@@ -63,8 +64,11 @@ def test_require_api_key_db_key_updates_last_used(db_session, monkeypatch):
     db_session.commit()
 
     assert api_key.last_used_at is None
+    monkeypatch.setattr(security._LastUsedWriter, "_ensure_started", lambda self: None)
     assert security.require_api_key(api_key=raw_key, db=db_session) is None
 
+    # last_used_at is written by the batch writer, not on the request path.
+    assert security._last_used_writer.flush(db=db_session) == 1
     db_session.refresh(api_key)
     assert api_key.last_used_at is not None
 
@@ -79,3 +83,52 @@ def test_auth_route_rejects_missing_key(client):
     response = client.get("/_auth_test")
     assert response.status_code == 401
     assert response.json()["detail"] == "Missing API key"
+
+
+def test_require_api_key_cache_hit_batches_last_used(db_session, monkeypatch):
+    monkeypatch.setattr(security, "DEBUG", False)
+    monkeypatch.setattr(security, "API_KEY", None)
+    security.invalidate_api_key_cache()
+
+    user = User(email="cache@example.com", password_hash="hash")
+    db_session.add(user)
+    db_session.flush()
+
+    raw_key = "cached-db-key"
+    api_key = APIKey(user_id=user.id, key_hash=security._hash_api_key(raw_key), is_active=True)
+    db_session.add(api_key)
+    db_session.commit()
+
+    monkeypatch.setattr(security._LastUsedWriter, "_ensure_started", lambda self: None)
+    # The first call queries the DB; the second is served from the cache.
+    assert security.require_api_key(api_key=raw_key, db=db_session) is None
+    first_used = security._last_used_writer._queue.queue[-1][1]
+    assert security.require_api_key(api_key=raw_key, db=db_session) is None
+
+    # Both touches coalesce into one row update carrying the latest timestamp.
+    assert security._last_used_writer.flush(db=db_session) == 1
+    db_session.refresh(api_key)
+    assert api_key.last_used_at >= first_used
+    security.invalidate_api_key_cache()
+
+
+def test_unknown_key_is_not_cached(db_session, monkeypatch):
+    monkeypatch.setattr(security, "DEBUG", False)
+    monkeypatch.setattr(security, "API_KEY", None)
+    security.invalidate_api_key_cache()
+
+    raw_key = "late-key"
+    with pytest.raises(HTTPException):
+        security.require_api_key(api_key=raw_key, db=db_session)
+
+    # Provisioned after the first (rejected) attempt: accepted immediately.
+    user = User(email="late@example.com", password_hash="hash")
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(APIKey(user_id=user.id, key_hash=security._hash_api_key(raw_key), is_active=True))
+    db_session.commit()
+
+    monkeypatch.setattr(security._LastUsedWriter, "_ensure_started", lambda self: None)
+    assert security.require_api_key(api_key=raw_key, db=db_session) is None
+    assert security._last_used_writer.flush(db=db_session) == 1
+    security.invalidate_api_key_cache()
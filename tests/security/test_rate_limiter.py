@@ -1,4 +1,8 @@
-from app.core.rate_limiter import RateLimiter
+import asyncio
+
+import pytest
+
+from app.core.rate_limiter import RateLimiter, RedisRateLimiter
 import app.core.rate_limiter as rate_limiter_module
 import app.main as main
 
@@ -27,7 +31,7 @@ def test_rate_limiter_allows_after_window(monkeypatch):
 def test_rate_limit_middleware_blocks_after_limit(client):
     main.rate_limiter.max_requests = 2
     main.rate_limiter.window_seconds = 60
-    main.rate_limiter._requests.clear()
+    main.rate_limiter.reset()
 
     first = client.get("/_test")
     second = client.get("/_test")
@@ -36,3 +40,84 @@ def test_rate_limit_middleware_blocks_after_limit(client):
     assert first.status_code == 200
     assert second.status_code == 200
     assert third.status_code == 429
+    assert int(third.headers["Retry-After"]) >= 1
+    assert third.json()["error"]["code"] == "agent.rate_limited"
+
+
+def test_rate_limiter_refills_proportionally(monkeypatch):
+    limiter = RateLimiter(max_requests=2, window_seconds=10)
+    times = iter([0.0, 0.0, 1.0, 5.0, 5.1])
+
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: next(times))
+
+    assert limiter.allow("client-1") is True
+    assert limiter.allow("client-1") is True
+    # 1s at 0.2 tokens/s is not enough for another request
+    assert limiter.allow("client-1") is False
+    # By t=5 one full token has been refilled
+    assert limiter.allow("client-1") is True
+    assert limiter.allow("client-1") is False
+
+
+def test_rate_limiter_rejects_non_power_of_two_shards():
+    with pytest.raises(ValueError):
+        RateLimiter(max_requests=1, window_seconds=1, shards=6)
+
+    limiter = RateLimiter(max_requests=1, window_seconds=10, shards=1)
+    assert limiter.allow("client-1") is True
+    assert limiter.allow("client-2") is True
+    assert limiter.allow("client-1") is False
+
+
+def test_fixed_window_resets_on_rollover(monkeypatch):
+    limiter = RateLimiter(max_requests=2, window_seconds=10, strategy="fixed_window")
+    times = iter([0.0, 1.0, 9.9, 10.0, 10.5])
+
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: next(times))
+
+    assert limiter.allow("client-1") is True
+    assert limiter.allow("client-1") is True
+    assert limiter.allow("client-1") is False
+    assert limiter.allow("client-1") is True
+    assert limiter.allow("client-1") is True
+
+
+def test_rate_limiter_check_reports_retry_after(monkeypatch):
+    limiter = RateLimiter(max_requests=2, window_seconds=10)
+    times = iter([0.0, 0.0, 1.0])
+
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: next(times))
+
+    assert limiter.check("client-1") == (True, 0.0)
+    assert limiter.check("client-1") == (True, 0.0)
+    allowed, retry_after = limiter.check("client-1")
+    assert allowed is False
+    # 0.2 tokens refilled; 0.8 more at 0.2 tokens/s
+    assert abs(retry_after - 4.0) < 1e-9
+
+
+def test_rate_limiter_sweep_evicts_idle_identifiers(monkeypatch):
+    limiter = RateLimiter(max_requests=2, window_seconds=10)
+    times = iter([0.0, 15.0])
+
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: next(times))
+
+    limiter.allow("idle-client")
+    limiter.allow("active-client")
+    limiter._sweep(20.0)
+    assert sum(len(buckets) for _, buckets in limiter._shards) == 2
+    limiter._sweep(20.1)
+    assert sum(len(buckets) for _, buckets in limiter._shards) == 1
+    limiter.close()
+
+
+def test_redis_rate_limiter_check_is_async_and_fails_open():
+    limiter = RedisRateLimiter(redis_url="redis://127.0.0.1:1/0", max_requests=1, window_seconds=10)
+
+    async def run():
+        try:
+            return await limiter.check("client-1")
+        finally:
+            await limiter.close()
+
+    assert asyncio.run(run()) == (True, 0.0)
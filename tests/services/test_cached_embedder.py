@@ -0,0 +1,37 @@
+import numpy as np
+
+from app.services.embeddings.base import BaseEmbeddingModel
+from app.services.embeddings.cached_embedder import CachedEmbedder
+
+VECTOR = np.array([0.1234567, -0.7654321, 0.3333333], dtype=np.float32)
+
+
+class _FixedEmbedder(BaseEmbeddingModel):
+    def __init__(self):
+        super().__init__("fixed")
+        self.dimension = 3
+        self.calls = 0
+
+    def embed(self, text):
+        self.calls += 1
+        texts = [text] if isinstance(text, str) else text
+        return [VECTOR.tolist() for _ in texts]
+
+    def get_dimension(self) -> int:
+        return 3
+
+
+def test_misses_return_full_precision_and_hits_come_from_cache():
+    inner = _FixedEmbedder()
+    cached = CachedEmbedder(inner, capacity=10)
+
+    first = cached.embed_batch(["a", "a", "b"])
+    assert first.dtype == np.float32
+    np.testing.assert_array_equal(first, np.stack([VECTOR] * 3))
+    assert inner.calls == 1
+    assert (cached.cache_hits, cached.cache_misses) == (1, 2)
+
+    again = cached.embed_batch(["b"])
+    assert inner.calls == 1
+    assert again.dtype == np.float32
+    np.testing.assert_array_equal(again[0], VECTOR.astype(np.float16).astype(np.float32))
@@ -0,0 +1,73 @@
+import pytest
+
+from app.services.document_processor import processor
+from app.services.document_processor.processor import DocumentProcessor, _count_words_lines
+
+TEXT = "One one. Two two. Three three. Four four."
+
+
+@pytest.fixture(autouse=True)
+def regex_splitter(monkeypatch):
+    monkeypatch.setattr(processor, "SENTENCE_SPLITTER", "regex")
+    processor._sentence_tokenizer.cache_clear()
+    yield
+    processor._sentence_tokenizer.cache_clear()
+
+
+def _chunk(text, chunk_size, chunk_overlap):
+    return DocumentProcessor(chunk_size=chunk_size, chunk_overlap=chunk_overlap)._chunk_by_sentence(text)
+
+
+def test_chunk_by_sentence_carries_trailing_sentences_into_overlap():
+    # "Two two." (8 chars) fits the 10-char overlap and starts the next chunk;
+    # "Three three." (12 chars) does not, so the third chunk starts fresh.
+    assert _chunk(TEXT, chunk_size=20, chunk_overlap=10) == [
+        "One one. Two two.",
+        "Two two. Three three.",
+        "Four four.",
+    ]
+
+
+def test_chunk_by_sentence_zero_overlap():
+    assert _chunk(TEXT, chunk_size=20, chunk_overlap=0) == [
+        "One one. Two two.",
+        "Three three.",
+        "Four four.",
+    ]
+
+
+def test_chunk_by_sentence_overlap_takes_several_sentences():
+    text = "Aa. Bb. Cc. Dd. Ee."
+    assert _chunk(text, chunk_size=12, chunk_overlap=7) == [
+        "Aa. Bb. Cc.",
+        "Bb. Cc. Dd.",
+        "Cc. Dd. Ee.",
+    ]
+
+
+def test_chunk_by_sentence_keeps_oversized_sentence_whole():
+    text = "A very long sentence here. Hi."
+    assert _chunk(text, chunk_size=10, chunk_overlap=5) == ["A very long sentence here.", "Hi."]
+
+
+def test_chunk_by_sentence_empty_text():
+    assert _chunk("", chunk_size=20, chunk_overlap=10) == []
+    assert _chunk("   ", chunk_size=20, chunk_overlap=10) == []
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "",
+        "one line",
+        "windows\r\nline endings\r\n",
+        "vertical\x0btab",
+        "file\x1cseparator and\x1dgroup\x1erecord\x1funit",
+        "trailing newline\n",
+        "\n\n  blank lines \n\n",
+        "form\x0cfeed\rcarriage",
+        "non-ascii\u2028line\u00a0nbsp",
+    ],
+)
+def test_count_words_lines_matches_split(content):
+    assert _count_words_lines(content) == (len(content.split()), len(content.splitlines()))
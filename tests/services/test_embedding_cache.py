@@ -0,0 +1,43 @@
+import asyncio
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import models
+from app.services.embeddings import embedding_cache
+from app.services.embeddings.base import BaseEmbeddingModel
+
+
+class _CountingEmbedder(BaseEmbeddingModel):
+    provider_name = "test"
+
+    def __init__(self):
+        super().__init__("counting")
+        self.dimension = 3
+        self.embedded = []
+
+    def embed(self, text):
+        texts = [text] if isinstance(text, str) else text
+        self.embedded.extend(texts)
+        return [[float(len(t)), 1.0, 0.0] for t in texts]
+
+    def get_dimension(self) -> int:
+        return 3
+
+
+def test_async_cache_uses_its_own_session(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    models.Base.metadata.create_all(bind=engine, tables=[models.EmbeddingCache.__table__])
+    monkeypatch.setattr(embedding_cache, "SessionLocal", sessionmaker(bind=engine))
+    model = _CountingEmbedder()
+
+    first = asyncio.run(embedding_cache.get_or_compute_embeddings_async(["a", "bb", "a"], model))
+    assert model.embedded == ["a", "bb"]
+    np.testing.assert_array_equal(first[:, 0], [1.0, 2.0, 1.0])
+
+    # Served from the table written by the first call.
+    second = asyncio.run(embedding_cache.get_or_compute_embeddings_async(["bb", "a"], model))
+    assert model.embedded == ["a", "bb"]
+    np.testing.assert_array_equal(second, first[[1, 0]])
+    engine.dispose()